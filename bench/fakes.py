@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import discord
+
+FRAME_SECONDS = 0.02
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enqueue: list[float] = []
+        self.first_audio: list[float] = []
+        self.handoff: list[float] = []
+        self.stream_seconds = 0.0
+        self.play_errors = 0
+        self.commands: dict[str, int] = {}
+
+    def add(self, name: str, value: float):
+        with self.lock:
+            getattr(self, name).append(value)
+
+    def count(self, command: str):
+        self.commands[command] = self.commands.get(command, 0) + 1
+
+
+class FakePlayer(threading.Thread):
+    """Reads the source every 20ms like discord's AudioPlayer, minus the network."""
+
+    def __init__(self, vc: "FakeVoiceClient", source, after: Optional[Callable]):
+        super().__init__(name=f"bench-player-{vc.guild.id}", daemon=True)
+        self.vc = vc
+        self.source = source
+        self.after = after
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.done = False
+
+    def run(self):
+        error = None
+        frames = 0
+        next_frame = time.perf_counter()
+        try:
+            while not self.stopped.is_set():
+                with self.lock:
+                    data = self.source.read()
+                if not data:
+                    break
+                if frames == 0:
+                    self.vc.on_first_audio(time.perf_counter())
+                frames += 1
+                next_frame += FRAME_SECONDS
+                time.sleep(max(0, next_frame - time.perf_counter()))
+        except Exception as e:
+            error = e
+        finally:
+            self.done = True
+            self.vc.on_end(time.perf_counter(), frames, error)
+            if self.after:
+                self.after(error)
+            self.source.cleanup()
+
+    def set_source(self, source):
+        with self.lock:
+            self.source = source
+
+    def stop(self):
+        self.stopped.set()
+
+
+class FakeVoiceClient:
+    def __init__(self, guild: "FakeGuild", channel: "FakeVoiceChannel", stats: Stats):
+        self.guild = guild
+        self.channel = channel
+        self.stats = stats
+        self.connected = True
+        self.player: Optional[FakePlayer] = None
+        self.requested_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+
+    def is_connected(self):
+        return self.connected
+
+    def is_playing(self):
+        return self.player is not None and not self.player.done
+
+    @property
+    def source(self):
+        return self.player.source if self.player else None
+
+    @source.setter
+    def source(self, value):
+        if self.player:
+            self.player.set_source(value)
+
+    def play(self, source, *, after=None):
+        if self.is_playing():
+            raise discord.ClientException("Already playing audio.")
+        self.player = FakePlayer(self, source, after)
+        self.player.start()
+
+    def stop(self):
+        if self.player:
+            self.player.stop()
+
+    def on_first_audio(self, now: float):
+        if self.ended_at is not None:
+            self.stats.add("handoff", now - self.ended_at)
+        elif self.requested_at is not None:
+            self.stats.add("first_audio", now - self.requested_at)
+
+    def on_end(self, now: float, frames: int, error: Optional[Exception]):
+        self.ended_at = now
+        with self.stats.lock:
+            self.stats.stream_seconds += frames * FRAME_SECONDS
+            if error:
+                self.stats.play_errors += 1
+
+    async def disconnect(self, *, force: bool = False):
+        self.stop()
+        self.connected = False
+        self.guild.voice_client = None
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild", stats: Stats):
+        self.guild = guild
+        self.stats = stats
+        self.members = []
+
+    async def connect(self, **kwargs) -> FakeVoiceClient:
+        vc = FakeVoiceClient(self.guild, self, self.stats)
+        self.guild.voice_client = vc
+        return vc
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, stats: Stats):
+        self.id = guild_id
+        self.voice_client: Optional[FakeVoiceClient] = None
+        self.voice_channel = FakeVoiceChannel(self, stats)
+
+
+class FakeMember:
+    def __init__(self, member_id: int, channel: FakeVoiceChannel):
+        self.id = member_id
+        self.bot = False
+        self.voice = SimpleNamespace(channel=channel)
+        self.guild_permissions = SimpleNamespace(manage_guild=True)
+        channel.members.append(self)
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+
+    async def send_message(self, content: str, **kwargs):
+        self.done = True
+        self.interaction.record(content)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content: str, **kwargs):
+        self.interaction.record(content)
+
+
+class FakeInteraction:
+    def __init__(self, guild: FakeGuild, user: FakeMember):
+        self.guild = guild
+        self.user = user
+        self.channel_id = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.created_at = time.perf_counter()
+        self.messages: list[tuple[float, str]] = []
+
+    def record(self, content: str):
+        self.messages.append((time.perf_counter(), content.strip()))
+
+    @property
+    def response_latency(self) -> Optional[float]:
+        if not self.messages:
+            return None
+        return self.messages[0][0] - self.created_at
+
+
+class FakeBot:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.db = None
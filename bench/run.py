@@ -0,0 +1,237 @@
+"""Offline load test for the music pipeline.
+
+Runs the real GuildPlayer, worker pool, schedulers and FFmpeg against fake
+Discord objects, a stub yt-dlp and a local HTTP server serving test audio.
+
+    python bench/run.py --guilds 20 --tracks 5 --extract-latency 1.5
+
+Requires ffmpeg on PATH and the bot's Python dependencies.
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+STUBS_DIR = os.path.join(BENCH_DIR, "stubs")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--tracks", type=int, default=5, help="/play calls per guild")
+    parser.add_argument("--track-seconds", type=int, default=20)
+    parser.add_argument("--extract-latency", type=float, default=1.0)
+    parser.add_argument("--tail-rate", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--skip-rate", type=float, default=0.3)
+    parser.add_argument("--remove-rate", type=float, default=0.2)
+    parser.add_argument("--ramp", type=float, default=5.0, help="guild start spread (s)")
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--time-limit", type=float, default=300.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--mode", choices=("opus", "pcm"), default="opus")
+    parser.add_argument("--memory-tracks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def configure_environment(args, workdir: str, audio_url: str, audio_file: str):
+    # Must run before the bot modules are imported: they read these at import time.
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        [STUBS_DIR, os.environ.get("PYTHONPATH", "")]
+    )
+    os.environ.update(
+        {
+            "BENCH_AUDIO_URL": audio_url,
+            "BENCH_AUDIO_FILE": audio_file,
+            "BENCH_TRACK_SECONDS": str(args.track_seconds),
+            "BENCH_EXTRACT_LATENCY": str(args.extract_latency),
+            "BENCH_EXTRACT_TAIL_RATE": str(args.tail_rate),
+            "BENCH_EXTRACT_FAILURE_RATE": str(args.failure_rate),
+            "PLAYBACK_MODE": args.mode,
+            "YTDL_WORKERS": str(args.workers),
+            "COOKIEFILE": "",
+            "AUDIO_CACHE_DIRECTORY": os.path.join(workdir, "audio_cache"),
+            "AUDIO_CACHE_ADMIT_PLAYS": str(10**9),
+            "LOUDNESS_NORMALIZATION": "false",
+            "LOUDNESS_FILE": os.path.join(workdir, "loudness.json"),
+        }
+    )
+    sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+    sys.path.insert(0, BENCH_DIR)
+
+
+def video_url(guild_index: int, track_index: int, **params) -> str:
+    video_id = f"g{guild_index:04d}t{track_index:05d}"[:11].ljust(11, "x")
+    query = "".join(f"&{key}={value}" for key, value in params.items())
+    return f"https://www.youtube.com/watch?v={video_id}{query}"
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def summarize(name: str, values: list[float]) -> str:
+    if not values:
+        return f"{name:<22} {'-':>6}"
+    return (
+        f"{name:<22} {len(values):>6} "
+        f"{percentile(values, 0.5) * 1000:>9.0f} "
+        f"{percentile(values, 0.95) * 1000:>9.0f} "
+        f"{max(values) * 1000:>9.0f}"
+    )
+
+
+async def run_guild(index: int, args, stats, bot):
+    from cogs.music import GuildPlayer
+    from fakes import FakeGuild, FakeInteraction, FakeMember
+
+    guild = FakeGuild(10_000 + index, stats)
+    member = FakeMember(index, guild.voice_channel)
+    player = GuildPlayer(bot, guild)
+    started = time.perf_counter()
+
+    await asyncio.sleep(random.uniform(0, args.ramp))
+    for track_index in range(args.tracks):
+        interaction = FakeInteraction(guild, member)
+        if guild.voice_client is None or not guild.voice_client.is_playing():
+            requested_at = interaction.created_at
+        await player.play(interaction, video_url(index, track_index))
+        stats.count("play")
+        if interaction.response_latency is not None:
+            stats.add("enqueue", interaction.response_latency)
+        if guild.voice_client and guild.voice_client.requested_at is None:
+            guild.voice_client.requested_at = requested_at
+        await asyncio.sleep(random.uniform(0, args.think_time))
+
+    while player.current or player.queue:
+        if time.perf_counter() - started > args.time_limit:
+            break
+        await asyncio.sleep(random.uniform(0.3, 1.0) * args.track_seconds)
+        roll = random.random()
+        vc = guild.voice_client
+        if roll < args.skip_rate and vc and vc.is_playing():
+            await player.skip(FakeInteraction(guild, member))
+            stats.count("skip")
+        elif roll < args.skip_rate + args.remove_rate and player.queue:
+            index_to_remove = random.randint(1, len(player.queue))
+            await player.remove(FakeInteraction(guild, member), index_to_remove)
+            stats.count("remove")
+
+    await player.leave_channel()
+    if player.leave_task:
+        player.leave_task.cancel()
+
+
+async def measure_queue_memory(args, bot) -> float:
+    from cogs.music import GuildPlayer, get_metadata
+    from fakes import FakeGuild, Stats
+    from utils.track import Track
+
+    player = GuildPlayer(bot, FakeGuild(1, Stats()))
+    urls = [
+        video_url(9999, n, bench_latency=0, bench_fail=0)
+        for n in range(args.memory_tracks)
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for url in urls:
+        data = await get_metadata(url)
+        player.queue.append(Track.from_info(data, url))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / len(urls)
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+async def main(args, stats):
+    from fakes import FakeBot
+    from utils.supervisor import ffmpeg_supervisor
+    from utils.worker import ytdl_pool
+
+    bot = FakeBot(asyncio.get_running_loop())
+    await ytdl_pool.start()
+    ffmpeg_supervisor.start()
+
+    cpu_before = cpu_seconds()
+    wall_before = time.perf_counter()
+    await asyncio.gather(
+        *(run_guild(index, args, stats, bot) for index in range(args.guilds))
+    )
+    wall = time.perf_counter() - wall_before
+
+    memory_per_track = await measure_queue_memory(args, bot)
+
+    ffmpeg_supervisor.stop()
+    # Closing the pool reaps the workers, so their CPU time shows up in RUSAGE_CHILDREN.
+    await ytdl_pool.close()
+    await asyncio.sleep(0.5)
+    cpu = cpu_seconds() - cpu_before
+    return wall, cpu, memory_per_track
+
+
+def report(args, stats, wall: float, cpu: float, memory_per_track: float):
+    print()
+    print(
+        f"guilds={args.guilds} tracks={args.tracks} mode={args.mode} "
+        f"workers={args.workers} extract_latency={args.extract_latency}s "
+        f"failure_rate={args.failure_rate}"
+    )
+    print(f"commands: {stats.commands}  play errors: {stats.play_errors}")
+    print()
+    print(f"{'metric':<22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    print(summarize("enqueue latency", stats.enqueue))
+    print(summarize("time to first audio", stats.first_audio))
+    print(summarize("handoff gap", stats.handoff))
+    print()
+    streams = stats.stream_seconds / wall if wall else 0
+    print(f"wall time              {wall:.1f}s")
+    print(f"audio streamed         {stats.stream_seconds:.0f}s ({streams:.1f} streams avg)")
+    if stats.stream_seconds:
+        print(
+            f"cpu per stream         {cpu / stats.stream_seconds * 100:.2f}% of a core "
+            f"({cpu:.1f}s cpu incl. ffmpeg and workers)"
+        )
+    print(f"memory per queued track {memory_per_track / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="cerberus-bench-") as workdir:
+        from audio_server import AudioServer, generate_audio
+
+        audio_file = os.path.join(workdir, "track.webm")
+        generate_audio(audio_file, args.track_seconds)
+        server = AudioServer(workdir)
+        server.start()
+        try:
+            configure_environment(
+                args, workdir, f"{server.base_url}/track.webm", audio_file
+            )
+            from fakes import Stats
+
+            stats = Stats()
+            wall, cpu, memory_per_track = asyncio.run(main(args, stats))
+            report(args, stats, wall, cpu, memory_per_track)
+        finally:
+            server.stop()
@@ -0,0 +1,125 @@
+"""Stand-in for yt_dlp used by the benchmark's worker processes.
+
+Every video resolves to the local test audio server. Latency and failures are
+configured through BENCH_* environment variables, and can be overridden per
+request with ``bench_latency`` / ``bench_fail`` query parameters.
+"""
+
+import os
+import random
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+AUDIO_URL = os.getenv("BENCH_AUDIO_URL", "http://127.0.0.1:8000/track.webm")
+AUDIO_FILE = os.getenv("BENCH_AUDIO_FILE", "track.webm")
+TRACK_SECONDS = int(os.getenv("BENCH_TRACK_SECONDS", "30"))
+EXTRACT_LATENCY = float(os.getenv("BENCH_EXTRACT_LATENCY", "1.0"))
+TAIL_RATE = float(os.getenv("BENCH_EXTRACT_TAIL_RATE", "0.05"))
+FAILURE_RATE = float(os.getenv("BENCH_EXTRACT_FAILURE_RATE", "0.0"))
+PLAYLIST_SIZE = int(os.getenv("BENCH_PLAYLIST_SIZE", "50"))
+# Real extract_info payloads carry dozens of formats; keep the stub's size comparable.
+FAKE_FORMATS = 40
+
+
+class DownloadError(Exception):
+    pass
+
+
+def query_value(url: str, name: str):
+    values = parse_qs(urlparse(url).query).get(name)
+    return values[0] if values else None
+
+
+def simulate_latency(url: str):
+    override = query_value(url, "bench_latency")
+    if override is not None:
+        latency = float(override)
+    else:
+        latency = EXTRACT_LATENCY * random.uniform(0.5, 1.5)
+        if random.random() < TAIL_RATE:
+            latency *= 5
+    time.sleep(latency)
+
+    fail = query_value(url, "bench_fail")
+    failure_rate = float(fail) if fail is not None else FAILURE_RATE
+    if random.random() < failure_rate:
+        raise DownloadError(f"simulated extraction failure: {url}")
+
+
+def video_info(url: str, video_id: str) -> dict:
+    expire = int(time.time()) + 6 * 60 * 60
+    stream_url = f"{AUDIO_URL}?id={video_id}&expire={expire}"
+    return {
+        "id": video_id,
+        "title": f"Bench track {video_id}",
+        "duration": TRACK_SECONDS,
+        "is_live": False,
+        "webpage_url": url,
+        "extractor": "youtube",
+        "url": stream_url,
+        "ext": "webm",
+        "acodec": "opus",
+        "abr": 128,
+        "asr": 48000,
+        "http_headers": {"User-Agent": "bench", "Accept": "*/*"},
+        "formats": [
+            {
+                "format_id": str(index),
+                "url": f"{stream_url}&itag={index}",
+                "ext": "webm",
+                "acodec": "opus",
+                "vcodec": "none",
+                "abr": 48 + index,
+                "filesize": 1_000_000 + index,
+                "http_headers": {"User-Agent": "bench", "Accept": "*/*"},
+                "fragments": [{"url": f"{stream_url}&sq={n}"} for n in range(5)],
+            }
+            for index in range(FAKE_FORMATS)
+        ],
+        "thumbnails": [
+            {"url": f"https://i.ytimg.com/vi/{video_id}/{n}.jpg", "id": str(n)}
+            for n in range(20)
+        ],
+    }
+
+
+class YoutubeDL:
+    def __init__(self, params: dict = None):
+        self.params = params or {}
+
+    def extract_info(self, url: str, download: bool = False, process: bool = True):
+        simulate_latency(url)
+
+        playlist_id = query_value(url, "list")
+        if playlist_id and not self.params.get("noplaylist", True):
+            return {
+                "id": playlist_id,
+                "title": f"Bench playlist {playlist_id}",
+                "entries": (
+                    {
+                        "id": f"{playlist_id[:7]}{n:04d}",
+                        "url": f"https://www.youtube.com/watch?v={playlist_id[:7]}{n:04d}",
+                        "title": f"Bench track {n}",
+                        "duration": TRACK_SECONDS,
+                    }
+                    for n in range(PLAYLIST_SIZE)
+                ),
+            }
+
+        video_id = query_value(url, "v") or url.rstrip("/").rsplit("/", 1)[-1]
+        return video_info(url, video_id)
+
+    def prepare_filename(self, info: dict) -> str:
+        return AUDIO_FILE
+
+    @staticmethod
+    def sanitize_info(info: dict) -> dict:
+        return info
+
+
+def parse_options(args: list[str]):
+    options = {"noplaylist": "--no-playlist" in args}
+    if "--cookies" in args:
+        options["cookiefile"] = args[args.index("--cookies") + 1]
+    return SimpleNamespace(ydl_opts=options)
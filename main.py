@@ -1,4 +1,6 @@
+import asyncio
 import os
+import signal
 import sys
 import traceback
 
@@ -8,6 +10,19 @@ from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
+from utils.cluster import (
+    SHARD_COUNT,
+    ClusterSupervisor,
+    current_cluster,
+    is_cluster_process,
+    is_supervisor,
+)
+from utils.cookie import cookie_snapshot
+from utils.db import Database
+from utils.metrics import start_metrics_server
+from utils.watchdog import watchdog
+from utils.worker import background_pool, ytdl_pool
+
 load_dotenv()
 
 intents = discord.Intents.default()
@@ -20,18 +35,73 @@ intents.voice_states = True
 intents.message_content = True
 
 
-class Cerberus(commands.Bot):
+# Sharded deployments run AutoShardedBot; each cluster process connects its own shards.
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
+
+
+class Cerberus(BotBase):
     def __init__(self, *, intents: discord.Intents):
-        super().__init__(command_prefix="/", intents=intents)
+        self.cluster_id, shard_ids = current_cluster()
+        if SHARD_COUNT:
+            super().__init__(
+                command_prefix="/",
+                intents=intents,
+                shard_count=SHARD_COUNT,
+                shard_ids=shard_ids,
+            )
+        else:
+            super().__init__(command_prefix="/", intents=intents)
+        self.db: Database | None = None
+        self.metrics_server = None
 
     async def setup_hook(self):
         guild = discord.Object(id=int(os.getenv("GUILD_ID")))
 
+        if is_cluster_process():
+            # The cluster supervisor stops processes with SIGTERM; shut down cleanly.
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGTERM, lambda: asyncio.create_task(self.close())
+                )
+            except NotImplementedError:
+                # Windows has no loop signal handlers; terminate() ends the process there.
+                pass
+
+        watchdog.start()
+        await ytdl_pool.start()
+
+        try:
+            self.metrics_server = await start_metrics_server()
+        except OSError as e:
+            print(f"메트릭 서버 시작 실패: {e}")
+
+        if os.getenv("DB_HOST"):
+            db = Database()
+            try:
+                await db.open()
+                self.db = db
+            except Exception as e:
+                print(f"DB 연결 실패, 기록 없이 실행합니다: {e}")
+
         await self.load_extension("cogs.music")
         await self.load_extension("cogs.logger")
+        await self.load_extension("cogs.diagnostics")
 
-        await self.tree.sync(guild=guild)
-        print("✅ Slash 명령어 동기화 완료!")
+        # Commands are global to the application; one cluster syncing them is enough.
+        if self.cluster_id == 0:
+            await self.tree.sync(guild=guild)
+            print("✅ Slash 명령어 동기화 완료!")
+
+    async def close(self):
+        watchdog.stop()
+        if self.metrics_server:
+            self.metrics_server.close()
+        if self.db:
+            await self.db.close()
+        await ytdl_pool.close()
+        await background_pool.close()
+        cookie_snapshot.close()
+        await super().close()
 
 
 bot = Cerberus(intents=intents)
@@ -39,10 +109,20 @@ bot = Cerberus(intents=intents)
 
 @bot.event
 async def on_ready():
-    print(f"{bot.user}에 로그인하였습니다!")
+    if bot.shard_count:
+        print(
+            f"{bot.user}에 로그인하였습니다! "
+            f"(클러스터 {bot.cluster_id}, 샤드 {bot.shard_ids}/{bot.shard_count})"
+        )
+    else:
+        print(f"{bot.user}에 로그인하였습니다!")
 
 
 if __name__ == "__main__":
+    if is_supervisor():
+        asyncio.run(ClusterSupervisor(os.path.abspath(__file__)).run())
+        sys.exit(0)
+
     try:
         bot.run(os.getenv("TOKEN"))
     except Exception as e:
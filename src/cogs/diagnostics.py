@@ -0,0 +1,39 @@
+from typing import Literal
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.message import send_message
+from utils.watchdog import watchdog
+
+
+class Diagnostics(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(
+        name="profiler", description="이벤트 루프 샘플링 프로파일러를 제어합니다."
+    )
+    @app_commands.describe(action="start: 시작, stop: 중지 후 결과 표시, report: 결과 표시")
+    @app_commands.default_permissions(administrator=True)
+    async def profiler(
+        self,
+        interaction: discord.Interaction,
+        action: Literal["start", "stop", "report"],
+    ):
+        if action == "start":
+            watchdog.set_profiling(True)
+            await send_message(interaction, "🔍 프로파일러를 시작했어요.", ephemeral=True)
+            return
+
+        if action == "stop":
+            watchdog.set_profiling(False)
+
+        await send_message(
+            interaction, f"```\n{watchdog.profile_report()}\n```", ephemeral=True
+        )
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Diagnostics(bot))
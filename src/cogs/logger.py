@@ -1,10 +1,13 @@
 import os
+from typing import Optional
 
 import discord
-import requests
 from discord.ext import commands
 
-IMAGE_DIRECTORY = "./images"
+from utils.archiver import AttachmentArchiver
+from utils.attachments import IMAGE_DIRECTORY, AttachmentStore
+from utils.ringbuffer import MessageRecord, MessageRingBuffer
+
 VALID_EXTENSIONS = [".png", ".jpg", ".jpeg", ".gif"]
 MAX_SIZE_BYTES = 25 * 1024 * 1024  # 25MB
 
@@ -12,65 +15,114 @@ MAX_SIZE_BYTES = 25 * 1024 * 1024  # 25MB
 class Logger(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.store = AttachmentStore(IMAGE_DIRECTORY)
+        self.archiver = AttachmentArchiver(self.store)
+        self.messages = MessageRingBuffer()
+        self.log_channel_id = int(os.getenv("LOG_CHANNEL"))
+        self.target_channel_id = int(os.getenv("TARGET_CHANNEL"))
+
+    async def cog_load(self):
+        await self.store.open()
+        self.archiver.start()
+
+    async def cog_unload(self):
+        await self.archiver.stop()
+        await self.store.close()
+
+    async def log_deleted_message(
+        self,
+        log_channel: discord.abc.Messageable,
+        channel_id: int,
+        record: MessageRecord,
+    ):
+        db = getattr(self.bot, "db", None)
+        if db:
+            db.deletion_log.add(
+                record.id, channel_id, record.author_id, record.content
+            )
+
+        content = f"{record.author_name} (userId: {record.author_id}): {record.content}"
+        stored_files = await self.store.get(record.id)
+
+        if stored_files:
+            await log_channel.send(
+                content=content,
+                files=[
+                    discord.File(path, filename=filename)
+                    for filename, path in stored_files
+                ],
+            )
+        else:
+            await log_channel.send(content=content)
+
+    def find_deleted_record(
+        self, message_id: int, cached_message: Optional[discord.Message]
+    ) -> Optional[MessageRecord]:
+        record = self.messages.pop(message_id)
+        if record is None and cached_message is not None:
+            record = MessageRecord.from_message(cached_message)
+        return record
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message):
-        log_channel = self.bot.get_channel(int(os.getenv("LOG_CHANNEL")))
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        log_channel = self.bot.get_channel(self.log_channel_id)
         if not log_channel:
             print("Logging failed due to an invalid logChannel!")
             return
 
-        if message.channel.id == int(os.getenv("TARGET_CHANNEL")):
-            image_paths = []
-            for attachment in message.attachments:
-                file_extension = os.path.splitext(attachment.filename)[1].lower()
-                file_name = f"{message.id}{attachment.id}{file_extension}"
-                image_path = os.path.join(IMAGE_DIRECTORY, file_name)
-                image_paths.append(image_path)
-
-            if image_paths:
-                await log_channel.send(
-                    content=f"{message.author.name} (userId: {message.author.id}): {message.content}",
-                    files=[discord.File(image_path) for image_path in image_paths],
-                )
-            else:
-                await log_channel.send(
-                    content=f"{message.author.name} (userId: {message.author.id}): {message.content}"
+        if payload.channel_id == self.target_channel_id:
+            record = self.find_deleted_record(
+                payload.message_id, payload.cached_message
+            )
+            if record is None:
+                print(f"Deleted message is not buffered: {payload.message_id}")
+                return
+            await self.log_deleted_message(
+                log_channel, payload.channel_id, record
+            )
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ):
+        log_channel = self.bot.get_channel(self.log_channel_id)
+        if not log_channel:
+            print("Logging failed due to an invalid logChannel!")
+            return
+
+        if payload.channel_id == self.target_channel_id:
+            cached_messages = {message.id: message for message in payload.cached_messages}
+            for message_id in sorted(payload.message_ids):
+                record = self.find_deleted_record(
+                    message_id, cached_messages.get(message_id)
                 )
-        print(message)
+                if record is not None:
+                    await self.log_deleted_message(
+                        log_channel, payload.channel_id, record
+                    )
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        if payload.channel_id == self.target_channel_id:
+            self.messages.update(payload.message)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        log_channel = self.bot.get_channel(int(os.getenv("LOG_CHANNEL")))
+        log_channel = self.bot.get_channel(self.log_channel_id)
         if not log_channel:
             print("Logging failed due to an invalid logChannel!")
             return
 
-        if message.channel.id == int(os.getenv("TARGET_CHANNEL")):
+        if message.channel.id == self.target_channel_id:
+            self.messages.add(message.channel.id, message)
             for attachment in message.attachments:
                 file_extension = os.path.splitext(attachment.filename)[1].lower()
                 if file_extension not in VALID_EXTENSIONS:
                     continue
                 if attachment.size > MAX_SIZE_BYTES:
                     continue
-                if not os.path.exists(IMAGE_DIRECTORY):
-                    os.makedirs(IMAGE_DIRECTORY)
-
-                file_name = f"{message.id}{attachment.id}{file_extension}"
-                file_path = os.path.join(IMAGE_DIRECTORY, file_name)
-
-                try:
-                    response = requests.get(attachment.url, stream=True)
-                    if response.status_code == 200:
-                        with open(file_path, "wb") as f:
-                            for chunk in response.iter_content(chunk_size=1024):
-                                if chunk:
-                                    f.write(chunk)
-                        print(f"Image uploaded and saved as: {file_name}")
-                    else:
-                        print(f"Failed to download image from {attachment.url}")
-                except Exception as e:
-                    print(f"Error saving image: {e}")
+
+                self.archiver.enqueue(message.id, attachment)
 
 
 async def setup(bot: commands.Bot):
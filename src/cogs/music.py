@@ -1,202 +1,487 @@
 import asyncio
-import json
+import os
 import re
+import threading
 import time
-from typing import Tuple, Optional
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import Callable, Optional
 
 import discord
-import yt_dlp
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
-from utils.cookie import TemporaryCookie
+from utils.audiocache import audio_cache
+from utils.backends import metadata_router
+from utils.cache import metadata_cache
+from utils.cookie import cookie_snapshot
+from utils.loudness import loudness
 from utils.message import send_message
-from utils.semaphore import yt_dlp_semaphore, ffmpeg_semaphore
-from utils.ytdl import ffmpeg_options, get_ytdl_options
+from utils.metrics import (
+    Counter,
+    Gauge,
+    errors_total,
+    extraction_seconds,
+    ffmpeg_startup_seconds,
+    handoff_seconds,
+    play_to_audio_seconds,
+    resumes_total,
+    retries_total,
+    timeouts_total,
+)
+from utils.prefetch import Prefetcher
+from utils.singleflight import extraction_flights, extraction_key
+from utils.semaphore import Priority, ffmpeg_scheduler, yt_dlp_scheduler
+from utils.session import session_store
+from utils.supervisor import ffmpeg_supervisor
+from utils.track import Track
+from utils.worker import background_pool, ytdl_pool
+from utils.ytdl import (
+    DEFAULT_VOLUME,
+    PLAYBACK_MODE,
+    ffmpeg_options,
+    file_ffmpeg_options,
+    get_opus_ffmpeg_options,
+    get_ytdl_options,
+    prebuffer_ffmpeg_options,
+    with_seek,
+)
 
 load_dotenv()
 
 MAX_MIN = 300
-
-
-async def get_metadata_from_url_cli(url: str):
-    async def job():
-        with TemporaryCookie() as cookiefile:
-            cmd = [
-                "yt-dlp",
-                "--no-check-certificate",
-                "--skip-download",
-                "--no-playlist",
-            ]
-            if cookiefile:
-                cmd += ["--cookies", cookiefile]
-            cmd += ["-j", url]
-
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise Exception(stderr.decode().strip())
-
-            return json.loads(stdout)
+MAX_QUEUE = int(os.getenv("MAX_QUEUE", "10"))
+PLAYLIST_TIMEOUT = 60
+GUILD_EXTRACTION_BUDGET = 2
+PLAYBACK_START_ATTEMPTS = 3
+MAX_RESUME_ATTEMPTS = 3
+RESUME_END_TOLERANCE = 5
+GAPLESS_PLAYBACK = os.getenv("GAPLESS_PLAYBACK", "false").lower() == "true"
+PREBUFFER_LEAD = 5
+PREBUFFER_MAX_FRAMES = 250
+PREBUFFER_MAX_BYTES = int(os.getenv("PREBUFFER_MAX_BYTES", str(2 * 1024 * 1024)))
+# Delay between guilds resuming after a restart, to spread out their stream setup.
+RESTORE_STAGGER = 1.0
+YTDL_POOLS = (("playback", ytdl_pool), ("background", background_pool))
+
+
+async def get_metadata(url: str, guild_id: int = 0) -> Optional[dict]:
+    cached = metadata_cache.get(url)
+    if cached:
+        print(f"메타데이터 캐시 적중: {cached['title']}")
+        return cached
+
+    async def extract():
+        data = await metadata_router.extract(url, guild_id, Priority.METADATA)
+        metadata_cache.put(url, data)
+        return data
 
     try:
         print("메타데이터 추출 중...")
         start = time.perf_counter()
 
-        async with yt_dlp_semaphore:
-            data = await asyncio.wait_for(job(), timeout=30)
+        data = await extraction_flights.run(extraction_key("metadata", url), extract)
 
         elapsed = int((time.perf_counter() - start) * 1000)
         print(f"메타데이터 추출 완료 (소요 시간: {elapsed}ms)")
-
-        return data["entries"][0] if "entries" in data else data
+        return data
     except asyncio.TimeoutError:
         print("메타데이터 추출 실패: Timeout")
+        timeouts_total.inc(stage="metadata")
         return None
     except Exception as e:
-        print(f"(메타데이터 추출 실패: {e})")
+        print(f"메타데이터 추출 실패: {e}")
+        errors_total.inc(stage="metadata")
         return None
 
 
-async def get_metadata_from_url_api(url: str):
+async def resolve_stream(url: str, guild_id: int = 0):
     async def job():
-        with TemporaryCookie() as cookiefile:
-            options = get_ytdl_options(cookiefile)
-            options.update(
-                {
-                    "skip_download": True,
-                    "noplaylist": True,
-                    "no_check_certificate": True,
-                    "quiet": True,
-                    "no_warnings": True,
-                }
-            )
+        options = get_ytdl_options(cookie_snapshot.path())
+        result = await ytdl_pool.submit("extract", options=options, url=url)
+        return result["info"]
+
+    try:
+        start = time.perf_counter()
+
+        async def extract():
+            async with yt_dlp_scheduler.slot(guild_id, Priority.PREFETCH):
+                data = await asyncio.wait_for(job(), timeout=30)
+            extraction_seconds.observe(time.perf_counter() - start, backend="prefetch")
+            metadata_cache.put(url, data)
+            return data
+
+        return await extraction_flights.run(extraction_key("stream", url), extract)
+    except asyncio.TimeoutError:
+        print("스트림 주소 확인 실패: Timeout")
+        timeouts_total.inc(stage="prefetch")
+        return None
+    except Exception as e:
+        print(f"스트림 주소 확인 실패: {e}")
+        errors_total.inc(stage="prefetch")
+        return None
 
-            def extract():
-                with yt_dlp.YoutubeDL(options) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    return info["entries"][0] if "entries" in info else info
 
-            loop = asyncio.get_event_loop()
-            result_data = await loop.run_in_executor(None, extract)
+async def stream_playlist(
+    url: str, on_entry: Callable[[dict], None], limit: int, guild_id: int = 0
+):
+    async def job():
+        options = get_ytdl_options(cookie_snapshot.path(), playlist=True)
+        return await background_pool.submit(
+            "playlist",
+            timeout=PLAYLIST_TIMEOUT,
+            on_partial=on_entry,
+            options=options,
+            url=url,
+            limit=limit,
+            max_duration=60 * MAX_MIN,
+        )
 
-            return result_data
     try:
-        print("메타데이터 추출 중...")
+        print("재생 목록 불러오는 중...")
         start = time.perf_counter()
 
-        async with yt_dlp_semaphore:
-            data = await asyncio.wait_for(job(), timeout=20)
+        # Listing runs outside the scheduler and on the background workers: a long
+        # playlist would otherwise hold a slot and a playback worker for its whole
+        # duration and skew the latency adaptation.
+        result = await job()
 
         elapsed = int((time.perf_counter() - start) * 1000)
-        print(f"메타데이터 추출 완료... (소요 시간: {elapsed}ms)")
-
-        return data
+        print(f"재생 목록 불러오기 완료: {result['count']}곡 (소요 시간: {elapsed}ms)")
+        extraction_seconds.observe(elapsed / 1000, backend="playlist")
+        return result
     except asyncio.TimeoutError:
-        print("메타데이터 추출 실패: Timeout")
-        return {}
+        print("재생 목록 불러오기 실패: Timeout")
+        timeouts_total.inc(stage="playlist")
+        return None
     except Exception as e:
-        print(f"메타데이터 추출 실패: {e}")
-        return {}
+        print(f"재생 목록 불러오기 실패: {e}")
+        errors_total.inc(stage="playlist")
+        return None
 
 
-class YTDLSource(discord.PCMVolumeTransformer):
-    def __init__(self, source, *, data, options, volume=0.5):
-        super().__init__(source, volume)
-        self.data = data
+OPUS_SILENCE = b"\xf8\xff\xfe"
+PCM_SILENCE = b"\x00" * discord.opus.Encoder.FRAME_SIZE
+
+
+class PlaybackHooks:
+    FRAME_SECONDS = 0.02
+
+    def init_hooks(self, track: Track, options: dict, position: float = 0):
+        self.track = track
         self.options = options
-        self.title = data.get("title")
-        self.url = data.get("url")
+        self.start_position = position
+        self.frames_read = 0
+        self.bytes_read = 0
+        self.created_at = time.perf_counter()
+        self.first_read = False
+        self.on_first_read = None
+        self.superseded = False
+        self.gain = 1.0
+        self.buffer: Optional[deque[bytes]] = None
+
+    @property
+    def position(self):
+        return self.start_position + self.frames_read * self.FRAME_SECONDS
+
+    def silence(self) -> bytes:
+        return OPUS_SILENCE if self.is_opus() else PCM_SILENCE
+
+    def start_prebuffer(self, max_frames: int, max_bytes: int):
+        # FFmpeg output is read ahead on a thread so the first frames are ready
+        # before the voice client asks for them. In PCM mode the volume is applied
+        # while filling, so a live volume change lags by the buffered audio.
+        self.buffer = deque()
+        self.buffer_bytes = 0
+        self.buffer_eof = False
+        self.buffer_closed = False
+        self.buffer_cond = threading.Condition()
+        threading.Thread(
+            target=self.fill_buffer,
+            args=(max_frames, max_bytes),
+            name="prebuffer",
+            daemon=True,
+        ).start()
+
+    def fill_buffer(self, max_frames: int, max_bytes: int):
+        produced = False
+        while True:
+            with self.buffer_cond:
+                while not self.buffer_closed and (
+                    len(self.buffer) >= max_frames or self.buffer_bytes >= max_bytes
+                ):
+                    self.buffer_cond.wait()
+                if self.buffer_closed:
+                    return
+            try:
+                frame = super().read()
+            except Exception:
+                frame = b""
+            if frame and not produced:
+                produced = True
+                ffmpeg_startup_seconds.observe(time.perf_counter() - self.created_at)
+            with self.buffer_cond:
+                if not frame:
+                    self.buffer_eof = True
+                    self.buffer_cond.notify_all()
+                    return
+                self.buffer.append(frame)
+                self.buffer_bytes += len(frame)
+                self.buffer_cond.notify_all()
+
+    def read_buffered(self) -> Optional[bytes]:
+        with self.buffer_cond:
+            if not self.buffer and not self.buffer_eof:
+                self.buffer_cond.wait(self.FRAME_SECONDS)
+            if self.buffer:
+                frame = self.buffer.popleft()
+                self.buffer_bytes -= len(frame)
+                self.buffer_cond.notify_all()
+                return frame
+            if self.buffer_eof:
+                return b""
+            # Underrun: keep the track alive; the stall supervisor sees no progress.
+            return None
+
+    def read(self):
+        if self.buffer is None:
+            frame = super().read()
+        else:
+            frame = self.read_buffered()
+            if frame is None:
+                return self.silence()
+        if not frame and self.superseded:
+            # A replacement source is already installed; don't end the track.
+            return self.silence()
+        if frame:
+            self.frames_read += 1
+            self.bytes_read += len(frame)
+        if not self.first_read:
+            self.first_read = True
+            if self.buffer is None:
+                ffmpeg_startup_seconds.observe(time.perf_counter() - self.created_at)
+            if self.on_first_read:
+                self.on_first_read()
+        return frame
+
+    def cleanup(self):
+        if self.buffer is not None:
+            with self.buffer_cond:
+                self.buffer_closed = True
+                self.buffer_cond.notify_all()
+        super().cleanup()
+
+
+class YTDLOpusSource(PlaybackHooks, discord.FFmpegOpusAudio):
+    def __init__(self, source, *, track, options, position=0, **kwargs):
+        super().__init__(source, **kwargs)
+        self.init_hooks(track, options, position)
+
+
+class YTDLSource(PlaybackHooks, discord.PCMVolumeTransformer):
+    def __init__(self, source, *, track, options, volume=DEFAULT_VOLUME, position=0):
+        super().__init__(source, volume)
+        self.init_hooks(track, options, position)
+
+    @staticmethod
+    async def create_opus_source(
+        filename,
+        track,
+        codec,
+        options,
+        volume,
+        ffmpeg_base=ffmpeg_options,
+        position=0,
+    ):
+        if not codec or codec == "none":
+            try:
+                codec, _ = await discord.FFmpegOpusAudio.probe(filename)
+            except Exception as e:
+                print(f"[WARN] 코덱 확인 실패: {e}")
+                codec = None
+
+        passthrough = codec == "opus" and volume == 1.0
+        print(f"[DEBUG] 코덱: {codec}, 패스스루: {passthrough}")
+        return YTDLOpusSource(
+            filename,
+            track=track,
+            options=options,
+            codec="opus" if passthrough else None,
+            position=position,
+            **with_seek(get_opus_ffmpeg_options(volume, ffmpeg_base), position),
+        )
 
     @classmethod
-    async def from_url(cls, url, *, loop=None, stream=False, data=None):
+    async def from_file(
+        cls, path, *, track, codec=None, volume=DEFAULT_VOLUME, position=0
+    ):
+        print(f"캐시된 오디오로 재생: {path}")
+        if PLAYBACK_MODE == "opus":
+            return await cls.create_opus_source(
+                path, track, codec, {}, volume, file_ffmpeg_options, position
+            )
+        return cls(
+            discord.FFmpegPCMAudio(path, **with_seek(file_ffmpeg_options, position)),
+            track=track,
+            options={},
+            volume=volume,
+            position=position,
+        )
+
+    @classmethod
+    async def from_url(
+        cls,
+        track: Track,
+        *,
+        loop=None,
+        stream=False,
+        volume=DEFAULT_VOLUME,
+        guild_id=0,
+        position=0,
+        prebuffer=False,
+    ):
+        url = track.url
+        ffmpeg_base = prebuffer_ffmpeg_options if prebuffer else ffmpeg_options
+        if stream and not track.has_valid_stream():
+            cached = metadata_cache.get_stream(url)
+            if cached:
+                track.update_stream(cached)
+
+        async def extract():
+            extract_start = time.perf_counter()
+            async with yt_dlp_scheduler.slot(guild_id, Priority.PLAYBACK):
+                result = await ytdl_pool.submit(
+                    "extract",
+                    options=get_ytdl_options(cookie_snapshot.path()),
+                    url=url,
+                    download=not stream,
+                )
+            extraction_seconds.observe(
+                time.perf_counter() - extract_start, backend="playback"
+            )
+            metadata_cache.put(url, result["info"])
+            return result
+
         async def job():
-            with TemporaryCookie() as cookiefile:
-                options = get_ytdl_options(cookiefile)
-
-                def extract():
-                    if data:
-                        return data
-                    print("[DEBUG] cookiefile:", options.get("cookiefile"))
-                    with yt_dlp.YoutubeDL(options) as ydl:
-                        _data = ydl.extract_info(url, download=not stream)
-                        return _data["entries"][0] if "entries" in _data else _data
-
-                result_data = await loop.run_in_executor(None, extract)
-
-                filename = (
-                    result_data["url"]
-                    if stream
-                    else yt_dlp.YoutubeDL(options).prepare_filename(result_data)
+            options = get_ytdl_options()
+
+            if stream and track.has_valid_stream():
+                filename = track.stream_url
+            else:
+                # Joins a prefetch or another request for the same video if one is running.
+                kind = "stream" if stream else "download"
+                result = await extraction_flights.run(
+                    extraction_key(kind, url), extract
                 )
+                track.update_stream(result["info"])
+                filename = track.stream_url if stream else result["filename"]
 
-                return cls(
-                    discord.FFmpegPCMAudio(filename, **ffmpeg_options),
-                    data=result_data,
-                    options=options,
+            if PLAYBACK_MODE == "opus":
+                return await cls.create_opus_source(
+                    filename, track, track.acodec, options, volume, ffmpeg_base, position
                 )
+            return cls(
+                discord.FFmpegPCMAudio(filename, **with_seek(ffmpeg_base, position)),
+                track=track,
+                options=options,
+                volume=volume,
+                position=position,
+            )
 
         try:
             print("영상 재생 초기화 중...")
             start = time.perf_counter()
 
-            loop = asyncio.get_event_loop()
-
-            async with ffmpeg_semaphore:
-                data = await asyncio.wait_for(job(), timeout=20)
+            async with ffmpeg_scheduler.slot(guild_id, Priority.PLAYBACK):
+                source = await asyncio.wait_for(job(), timeout=20)
 
             elapsed = int((time.perf_counter() - start) * 1000)
             print(f"영상 재생 초기화 완료 (소요 시간: {elapsed}ms)")
 
-            return data
+            return source
         except asyncio.TimeoutError:
             print("영상 재생 초기화 실패: Timeout")
+            timeouts_total.inc(stage="playback")
             return None
         except Exception as e:
             print(f"영상 재생 초기화 실패: {e}")
+            errors_total.inc(stage="playback")
             return None
 
 
-class Music(commands.Cog):
-    def __init__(self, bot: commands.Bot):
+class GuildPlayer:
+    def __init__(self, bot: commands.Bot, guild: discord.Guild):
         self.bot = bot
-        self.queue = []
-        self.current = None
+        self.guild = guild
+        self.queue: deque[Track] = deque()
+        self.current: Optional[Track] = None
         self.force_stop = False
         self.playing_task = False
+        self.volume = DEFAULT_VOLUME
         self.leave_task: Optional[asyncio.Task] = None
+        self.extraction_budget = asyncio.Semaphore(GUILD_EXTRACTION_BUDGET)
+        self.prefetcher = Prefetcher(partial(resolve_stream, guild_id=guild.id))
+        self.handoff_started_at: Optional[float] = None
+        self.source: Optional[PlaybackHooks] = None
+        self.skip_requested = False
+        self.resume_attempts = 0
+        self.next_source: Optional[PlaybackHooks] = None
+        self.prebuffer_task: Optional[asyncio.Task] = None
+        self.text_channel_id: Optional[int] = None
+
+    @property
+    def voice_client(self) -> Optional[discord.VoiceClient]:
+        return self.guild.voice_client
+
+    def update_prefetch(self):
+        self.prefetcher.update([track.url for track in self.queue])
+        if self.next_source is not None and (
+            not self.queue or self.queue[0] is not self.next_source.track
+        ):
+            # The queue changed under the pre-buffered source.
+            asyncio.create_task(self.discard_prebuffer())
 
-    async def leave_channel(
-        self, guild: discord.Guild, interaction: discord.Interaction = None
-    ):
-        vc = discord.utils.get(self.bot.voice_clients, guild=guild)
+    @staticmethod
+    def record_handoff(started_at: float):
+        elapsed = time.perf_counter() - started_at
+        handoff_seconds.observe(elapsed)
+        print(f"곡 전환 완료 (첫 오디오까지: {int(elapsed * 1000)}ms)")
+
+    @staticmethod
+    def record_first_audio(requested_at: float):
+        play_to_audio_seconds.observe(time.perf_counter() - requested_at)
+
+    async def leave_channel(self, interaction: discord.Interaction = None):
+        vc = self.voice_client
         if not vc or not vc.is_connected():
             return
 
+        # Set before stopping so after_play doesn't mistake this for a stream failure.
+        self.force_stop = True
         if vc.is_playing():
             vc.stop()
             await asyncio.sleep(0.3)
 
         self.queue.clear()
+        self.prefetcher.clear()
+        if self.prebuffer_task:
+            self.prebuffer_task.cancel()
+        await self.discard_prebuffer()
+        ffmpeg_supervisor.unwatch(self.guild.id)
         self.current = None
-        self.force_stop = True
+        self.source = None
 
         await vc.disconnect()
         if interaction:
             await send_message(interaction, "👋 음성 채널에서 나왔습니다.")
 
-    async def check_and_leave_if_alone(
-        self, guild: discord.Guild, channel: discord.VoiceChannel
-    ):
+    async def check_and_leave_if_alone(self, channel: discord.VoiceChannel):
         print("확인 중...")
         await asyncio.sleep(10)
 
-        vc = discord.utils.get(self.bot.voice_clients, guild=guild)
+        vc = self.voice_client
         if not vc or not vc.is_connected():
             return
 
@@ -205,15 +490,13 @@ class Music(commands.Cog):
 
         members = [m for m in channel.members if not m.bot]
         if len(members) == 0:
-            await self.leave_channel(guild)
+            await self.leave_channel()
 
     @staticmethod
     def has_permission(
-        interaction: discord.Interaction,
-        music: Tuple[str, str, int, dict],
-        vc: discord.VoiceClient,
+        interaction: discord.Interaction, track: Track, vc: discord.VoiceClient
     ):
-        _, _, request_user_id, _ = music
+        request_user_id = track.requester_id
         if interaction.user.guild_permissions.manage_guild:
             return True
         if interaction.user.id == request_user_id:
@@ -223,32 +506,17 @@ class Music(commands.Cog):
             return True
         return False
 
-    @commands.Cog.listener()
-    async def on_voice_state_update(self, member, before, after):
-        if member.bot:
-            return
-
-        if before.channel and before.channel != after.channel:
-            vc = discord.utils.get(self.bot.voice_clients, guild=member.guild)
-            if vc and vc.channel == before.channel:
-                self.bot.loop.create_task(
-                    self.check_and_leave_if_alone(member.guild, before.channel)
-                )
-
-    @app_commands.command(name="play", description="유튜브 링크로 음악을 재생합니다.")
-    @app_commands.describe(url="유튜브 비디오 URL")
-    async def play(self, interaction: discord.Interaction, url: str):
-        self.force_stop = False
-        self.playing_task = True
-
+    async def connect_for_request(
+        self, interaction: discord.Interaction, url: str, playlist: bool = False
+    ) -> Optional[discord.VoiceClient]:
         voice_channel = interaction.user.voice.channel
-        vc = discord.utils.get(self.bot.voice_clients, guild=interaction.guild)
+        vc = self.voice_client
 
         if not interaction.user.voice or not interaction.user.voice.channel:
             await send_message(
                 interaction, "⚠️ 먼저 음성 채널에 참가해주세요.", ephemeral=True
             )
-            return
+            return None
 
         if vc and vc.is_connected():
             user_channel = interaction.user.voice.channel if interaction.user.voice else None
@@ -257,23 +525,25 @@ class Music(commands.Cog):
                     await send_message(
                         interaction, "⚠️ 봇이 이미 다른 채널에 있어요.", ephemeral=True
                     )
-                    return
+                    return None
                 else:
                     await vc.disconnect()
                     vc = await voice_channel.connect()
 
-        if len(self.queue) >= 10:
+        if len(self.queue) >= MAX_QUEUE:
             await send_message(
-                interaction, "⚠️ 대기열은 최대 10곡까지 가능합니다.", ephemeral=True
+                interaction,
+                f"⚠️ 대기열은 최대 {MAX_QUEUE}곡까지 가능합니다.",
+                ephemeral=True,
             )
-            return
+            return None
 
         p = re.compile(r"^(https?://)?(www\.|m\.)?(youtube\.com|youtu\.be)/.+$")
-        if not p.match(url):
+        if not p.match(url) or (playlist and "list=" not in url):
             await send_message(
                 interaction, "❌ 유효한 YouTube URL이 아닙니다.", ephemeral=True
             )
-            return
+            return None
 
         if not vc or not vc.is_connected():
             vc = await voice_channel.connect()
@@ -286,14 +556,32 @@ class Music(commands.Cog):
                 pass
         self.leave_task = None
 
+        self.text_channel_id = interaction.channel_id
         await interaction.response.defer()
+        return vc
+
+    async def play(self, interaction: discord.Interaction, url: str):
+        requested_at = time.perf_counter()
+        self.force_stop = False
+        self.playing_task = True
+
+        vc = await self.connect_for_request(interaction, url)
+        if vc is None:
+            self.playing_task = False
+            return
 
         try:
-            get_from_cli = vc.is_playing()
-            if get_from_cli:
-                data = await get_metadata_from_url_cli(url)
-            else:
-                data = await get_metadata_from_url_api(url)
+            async with self.extraction_budget:
+                data = await get_metadata(url, self.guild.id)
+            if not data:
+                await send_message(
+                    interaction,
+                    "❌ 영상 정보를 가져오지 못했어요.",
+                    followup=True,
+                    ephemeral=True,
+                )
+                return
+
             title = data["title"] or url
             is_live = data["is_live"]
             duration = int(data["duration"])
@@ -312,14 +600,14 @@ class Music(commands.Cog):
                 )
                 return
 
-            self.queue.append(
-                (title, url, interaction.user.id, data if not get_from_cli else None)
-            )
+            self.queue.append(Track.from_info(data, url, interaction.user.id))
+            if vc.is_playing():
+                self.update_prefetch()
 
             if (
                 not vc.is_playing()  # To resolve the race condition, recall is_playing() again
             ):
-                await self.play_next(vc, interaction)
+                await self.play_next(vc, interaction, requested_at)
             else:
                 await send_message(
                     interaction,
@@ -333,53 +621,116 @@ class Music(commands.Cog):
         finally:
             self.playing_task = False
 
-    async def play_next(self, vc, interaction):
+    async def play_playlist(self, interaction: discord.Interaction, url: str):
+        requested_at = time.perf_counter()
+        self.force_stop = False
+        self.playing_task = True
+
+        vc = await self.connect_for_request(interaction, url, playlist=True)
+        if vc is None:
+            self.playing_task = False
+            return
+
+        added = 0
+        started = False
+
+        def on_entry(entry: dict):
+            nonlocal added, started
+            if self.force_stop or len(self.queue) >= MAX_QUEUE:
+                return
+            self.queue.append(
+                Track.from_info(entry, entry["webpage_url"], interaction.user.id)
+            )
+            added += 1
+            if not started and not vc.is_playing():
+                # Start on the first entry; the rest keep streaming in behind it.
+                started = True
+                self.bot.loop.create_task(self.play_next(vc, interaction, requested_at))
+            else:
+                self.update_prefetch()
+
+        try:
+            result = await stream_playlist(
+                url, on_entry, MAX_QUEUE - len(self.queue), self.guild.id
+            )
+            if not added:
+                await send_message(
+                    interaction,
+                    "❌ 재생 목록에서 추가할 수 있는 곡을 찾지 못했어요.",
+                    followup=True,
+                    ephemeral=True,
+                )
+                return
+
+            name = result["title"] if result else url
+            await send_message(
+                interaction,
+                f"🎵 재생 목록 [{name}]({url})에서 {added}곡을 추가했어요!",
+                followup=True,
+            )
+        except Exception as e:
+            await send_message(
+                interaction, f"⚠️ 오류 발생: {e}", followup=True, ephemeral=True
+            )
+        finally:
+            self.playing_task = False
+
+    async def play_next(
+        self,
+        vc,
+        interaction,
+        requested_at: Optional[float] = None,
+        position: float = 0,
+    ):
         while self.queue:
             if self.force_stop:
                 return
 
-            title, url, requested_user_id, data = self.queue.pop(0)
-            self.current = (title, url, requested_user_id, data)
-            for attempt in range(5):
+            track = self.current = self.queue.popleft()
+            start_position, position = position, 0
+            audio_cache.record_play(track.url)
+            prebuffered = self.take_prebuffered(track)
+            for attempt in range(PLAYBACK_START_ATTEMPTS):
                 try:
-                    player = await YTDLSource.from_url(
-                        url, loop=self.bot.loop, stream=True, data=data
+                    if prebuffered is not None:
+                        player, prebuffered = prebuffered, None
+                    else:
+                        player = await self.create_source(track, start_position)
+
+                    handoff_started_at, self.handoff_started_at = (
+                        self.handoff_started_at,
+                        None,
                     )
+                    if player and handoff_started_at:
+                        player.on_first_read = lambda: self.record_handoff(
+                            handoff_started_at
+                        )
+                    elif player and requested_at:
+                        player.on_first_read = lambda: self.record_first_audio(
+                            requested_at
+                        )
 
-                    def after_play(err):
-                        if self.force_stop:
-                            return
-                        if err:
-                            print(f"오류 발생: {err}")
-                            asyncio.run_coroutine_threadsafe(
-                                send_message(
-                                    interaction,
-                                    f"⚠️ 재생 중 오류 발생: {err}. 다음 곡으로 넘어갑니다.",
-                                    followup=True,
-                                ),
-                                self.bot.loop,
-                            )
-                        self.bot.loop.create_task(self.play_next(vc, interaction))
-
-                    vc.play(player, after=after_play)
-
-                    ffmpeg_process = getattr(player, "_process", None)
-                    if ffmpeg_process:
-                        async def monitor_ffmpeg_kill(process, timeout=20):
-                            await asyncio.sleep(timeout)
-                            if process and process.poll() is None:
-                                print("[WARNING] FFmpeg 프로세스 강제 종료됨 (timeout)")
-                                process.kill()
-                        await asyncio.create_task(monitor_ffmpeg_kill(ffmpeg_process, timeout=20))
+                    self.resume_attempts = 0
+                    self.skip_requested = False
+                    self.start_playback(vc, interaction, player)
+                    self.update_prefetch()
+                    self.analyze_loudness(track)
+
+                    db = getattr(self.bot, "db", None)
+                    if db:
+                        db.play_history.add(
+                            self.guild.id, track.id, track.title, track.requester_id
+                        )
 
                     await send_message(
                         interaction,
-                        f"🎶 재생 중: **[{title}]({url})**",
+                        f"🎶 재생 중: **[{track.title}]({track.url})**",
                         followup=True,
                     )
                     return
                 except Exception as e:
-                    if attempt < 4:
+                    if attempt < PLAYBACK_START_ATTEMPTS - 1:
+                        retries_total.inc()
                         await asyncio.sleep(3)
                     else:
                         await send_message(
@@ -387,22 +738,264 @@ class Music(commands.Cog):
                         )
         if not self.queue and not self.playing_task:
             self.current = None
-            self.leave_task = asyncio.create_task(self.wait_and_leave(interaction.guild))
+            self.source = None
+            self.handoff_started_at = None
+            self.leave_task = asyncio.create_task(self.wait_and_leave())
             # await self.leave_channel(interaction.guild)
 
-    async def wait_and_leave(self, guild):
+    def start_playback(self, vc, interaction, player: PlaybackHooks):
+        def after_play(err):
+            self.bot.loop.call_soon_threadsafe(ffmpeg_supervisor.unwatch, self.guild.id)
+            if self.force_stop:
+                return
+            # The stall supervisor may have swapped in a replacement source.
+            source = self.source or player
+            if self.should_resume(source, err):
+                print(f"스트림 중단 감지 ({err or '조기 종료'}), 이어서 재생합니다.")
+                asyncio.run_coroutine_threadsafe(
+                    self.resume_current(vc, interaction, source.position),
+                    self.bot.loop,
+                )
+                return
+            self.handoff_started_at = time.perf_counter()
+            if err:
+                print(f"오류 발생: {err}")
+                asyncio.run_coroutine_threadsafe(
+                    send_message(
+                        interaction,
+                        f"⚠️ 재생 중 오류 발생: {err}. 다음 곡으로 넘어갑니다.",
+                        followup=True,
+                    ),
+                    self.bot.loop,
+                )
+            # Called from the player thread: wake the loop right away for the handoff.
+            asyncio.run_coroutine_threadsafe(
+                self.play_next(vc, interaction), self.bot.loop
+            )
+
+        vc.play(player, after=after_play)
+        self.source = player
+        self.watch_source(player)
+        self.schedule_prebuffer(player)
+
+    def snapshot(self) -> Optional[dict]:
+        vc = self.voice_client
+        if not vc or not vc.is_connected() or not (self.current or self.queue):
+            return None
+        source = self.source
+        position = 0
+        if source is not None and self.current and source.track is self.current:
+            position = round(source.position, 1)
+        return {
+            "voice_channel_id": vc.channel.id,
+            "text_channel_id": self.text_channel_id,
+            "volume": self.volume,
+            "current": self.current.to_record() if self.current else None,
+            "position": position,
+            "queue": [track.to_record() for track in self.queue],
+        }
+
+    async def restore(self, channel: discord.VoiceChannel, session: dict):
+        records = session["queue"]
+        if session["current"]:
+            records = [session["current"], *records]
+        tracks = [Track.from_record(record) for record in records]
+        for track in tracks:
+            # Stream URLs that are still valid let playback and prefetch skip yt-dlp.
+            if track.has_valid_stream():
+                metadata_cache.put(track.url, track.stream_info())
+
+        # Connect first: a failed connect must not leave the old tracks queued for
+        # whoever uses /play next.
+        vc = await channel.connect()
+        self.volume = session["volume"]
+        self.text_channel_id = session["text_channel_id"]
+        self.force_stop = False
+        self.queue.extend(tracks)
+
+        # The original interactions are gone; announce in the channel /play came from.
+        target = self.guild.get_channel(self.text_channel_id or 0) or channel
+        position = session["position"] if session["current"] else 0
+        print(f"재생 세션 복원: {len(tracks)}곡 ({int(position)}초부터)")
+        await self.play_next(vc, target, position=position)
+
+    def should_resume(self, player: PlaybackHooks, err) -> bool:
+        if self.skip_requested or self.resume_attempts >= MAX_RESUME_ATTEMPTS:
+            return False
+        duration = player.track.duration
+        if not duration:
+            return False
+        # A healthy stream ends within a few seconds of the track's duration.
+        return err is not None or player.position < duration - RESUME_END_TOLERANCE
+
+    async def resume_current(self, vc, interaction, position: float):
+        if not self.current or self.force_stop or not vc.is_connected():
+            return
+
+        self.resume_attempts += 1
+        resumes_total.inc()
+        track = self.current
+        source = await self.create_source(track, position, refresh=True)
+        if self.force_stop:
+            if source is not None:
+                await asyncio.to_thread(source.cleanup)
+            return
+        if source is None:
+            await send_message(
+                interaction,
+                f"⚠️ [{track.title}]({track.url}) 재생을 이어가지 못해 다음 곡으로 넘어갑니다.",
+                followup=True,
+            )
+            await self.play_next(vc, interaction)
+            return
+        self.start_playback(vc, interaction, source)
+
+    async def create_source(
+        self,
+        track: Track,
+        position: float = 0,
+        refresh: bool = False,
+        prebuffer: bool = False,
+    ):
+        if refresh:
+            # Keep the static metadata but force a fresh signed stream URL.
+            metadata_cache.invalidate_stream(track.url)
+            track.clear_stream()
+
+        # Loudness normalization is a constant gain folded into the volume.
+        gain = loudness.gain(track.id) if self.applies_gain() else 1.0
+        cached_audio = audio_cache.lookup(track.url)
+        if cached_audio:
+            source = await YTDLSource.from_file(
+                cached_audio["path"],
+                track=track,
+                codec=cached_audio["acodec"],
+                volume=self.volume * gain,
+                position=position,
+            )
+        else:
+            source = await YTDLSource.from_url(
+                track,
+                loop=self.bot.loop,
+                stream=True,
+                volume=self.volume * gain,
+                guild_id=self.guild.id,
+                position=position,
+                prebuffer=prebuffer,
+            )
+        if source is not None:
+            source.gain = gain
+        return source
+
+    def applies_gain(self) -> bool:
+        # Opus passthrough at 100% volume saves a full decode and encode per stream,
+        # which is worth more than normalized loudness.
+        return PLAYBACK_MODE != "opus" or self.volume != 1.0
+
+    def analyze_loudness(self, track: Track):
+        if not self.applies_gain():
+            return
+        cached_audio = audio_cache.entries.get(track.id)
+        loudness.request(
+            track.id, cached_audio["path"] if cached_audio else track.stream_url
+        )
+
+    def schedule_prebuffer(self, source: PlaybackHooks):
+        if not GAPLESS_PLAYBACK:
+            return
+        if self.prebuffer_task and not self.prebuffer_task.done():
+            self.prebuffer_task.cancel()
+        self.prebuffer_task = asyncio.create_task(self.prebuffer_next(source))
+
+    async def prebuffer_next(self, source: PlaybackHooks):
+        duration = source.track.duration
+        if not duration:
+            return
+        # Position only advances while audio is actually read, so re-check after sleeping.
+        while (remaining := duration - source.position) > PREBUFFER_LEAD:
+            await asyncio.sleep(remaining - PREBUFFER_LEAD)
+        if self.source is not source or not self.queue or self.force_stop:
+            return
+
+        track = self.queue[0]
+        if self.next_source is not None:
+            if self.next_source.track is track:
+                return
+            await self.discard_prebuffer()
+
+        next_source = await self.create_source(track, prebuffer=True)
+        if next_source is None:
+            return
+        if self.force_stop or not self.queue or self.queue[0] is not track:
+            await asyncio.to_thread(next_source.cleanup)
+            return
+        next_source.start_prebuffer(PREBUFFER_MAX_FRAMES, PREBUFFER_MAX_BYTES)
+        self.next_source = next_source
+        print(f"다음 곡 미리 준비 완료: {track.title}")
+
+    def take_prebuffered(self, track: Track) -> Optional[PlaybackHooks]:
+        source, self.next_source = self.next_source, None
+        if source is not None and source.track is track:
+            return source
+        if source is not None:
+            asyncio.create_task(asyncio.to_thread(source.cleanup))
+        return None
+
+    async def discard_prebuffer(self):
+        source, self.next_source = self.next_source, None
+        if source is not None:
+            await asyncio.to_thread(source.cleanup)
+
+    def watch_source(self, source: discord.AudioSource):
+        vc = self.voice_client
+        ffmpeg_supervisor.watch(
+            self.guild.id,
+            source,
+            is_active=lambda: vc.is_connected() and vc.is_playing(),
+            on_stall=lambda: self.restart_current(source),
+        )
+
+    async def restart_current(self, stalled_source: PlaybackHooks):
+        vc = self.voice_client
+        if not vc or vc.source is not stalled_source or not self.current:
+            return
+
+        # Stall restarts share the resume budget; a stream that keeps stalling is skipped.
+        if self.resume_attempts >= MAX_RESUME_ATTEMPTS:
+            print(f"[WARN] 재시작 한도 초과, 다음 곡으로 넘어갑니다: {self.current.url}")
+            vc.stop()
+            return
+        self.resume_attempts += 1
+
+        position = stalled_source.position
+        print(f"재생 재시작: {self.current.url} ({int(position)}초부터)")
+        source = await self.create_source(self.current, position, refresh=True)
+        if source is None or vc.source is not stalled_source:
+            if source is not None:
+                await asyncio.to_thread(source.cleanup)
+            else:
+                vc.stop()
+            return
+
+        stalled_source.superseded = True
+        vc.source = source
+        self.source = source
+        self.watch_source(source)
+        self.schedule_prebuffer(source)
+        await asyncio.to_thread(stalled_source.cleanup)
+
+    async def wait_and_leave(self):
         wait_sec = 120
         try:
             await asyncio.sleep(wait_sec)
             if not self.queue and not self.current:
-                await self.leave_channel(guild)
+                await self.leave_channel()
         except asyncio.CancelledError:
             pass
         self.leave_task = None
 
-    @app_commands.command(name="skip", description="현재 재생 중인 곡을 스킵합니다.")
     async def skip(self, interaction: discord.Interaction):
-        vc = discord.utils.get(self.bot.voice_clients, guild=interaction.guild)
+        vc = self.voice_client
 
         if not vc or not vc.is_connected():
             await send_message(
@@ -416,14 +1009,14 @@ class Music(commands.Cog):
             )
             return
 
-        if Music.has_permission(interaction, self.current, vc):
+        if GuildPlayer.has_permission(interaction, self.current, vc):
             await send_message(interaction, "⏭️ 현재 곡을 스킵했어요!")
+            self.skip_requested = True
             vc.stop()
         else:
             await send_message(interaction, "❌ 해당 곡을 스킵할 권한이 없어요.")
 
-    @app_commands.command(name="queue", description="현재 대기열을 확인합니다.")
-    async def queue_command(self, interaction: discord.Interaction):
+    async def show_queue(self, interaction: discord.Interaction):
         now_playing = self.get_now_playing_text() + "\n\n"
 
         if not self.queue:
@@ -435,47 +1028,284 @@ class Music(commands.Cog):
             return
 
         display = ""
-        for i, (title, url, *_) in enumerate(self.queue[:10]):
-            display += f"{i + 1}. [{title}]({url})\n"
+        for i, track in enumerate(islice(self.queue, 10)):
+            display += f"{i + 1}. [{track.title}]({track.url})\n"
         await send_message(
             interaction,
             f"{now_playing}🎶 현재 대기열:\n{display}",
             suppress_embeds=True,
         )
 
-    @app_commands.command(name="remove", description="대기열에서 특정 곡을 제거합니다.")
-    @app_commands.describe(index="제거할 곡 번호 (1부터 시작)")
-    async def remove_command(self, interaction: discord.Interaction, index: int):
+    async def remove(self, interaction: discord.Interaction, index: int):
         if index < 1 or index > len(self.queue):
             await send_message(
                 interaction, "❌ 유효하지 않은 번호입니다.", ephemeral=True
             )
             return
-        vc = discord.utils.get(self.bot.voice_clients, guild=interaction.guild)
-        if Music.has_permission(interaction, self.queue[index - 1], vc):
-            title, url, *_ = self.queue.pop(index - 1)
+        vc = self.voice_client
+        if GuildPlayer.has_permission(interaction, self.queue[index - 1], vc):
+            track = self.queue[index - 1]
+            del self.queue[index - 1]
+            self.update_prefetch()
             await send_message(
-                interaction, f"🗑️ `[{title}]({url})`을 대기열에서 제거했어요."
+                interaction, f"🗑️ `[{track.title}]({track.url})`을 대기열에서 제거했어요."
             )
         else:
             await send_message(interaction, "❌ 해당 곡을 삭제할 권한이 없어요.")
 
-    @app_commands.command(name="leave", description="봇을 음성 채널에서 나가게 합니다.")
-    async def leave(self, interaction: discord.Interaction):
-        await self.leave_channel(interaction.guild, interaction)
+    async def set_volume(self, interaction: discord.Interaction, percent: int):
+        if percent < 1 or percent > 200:
+            await send_message(
+                interaction, "❌ 볼륨은 1에서 200 사이로 입력해주세요.", ephemeral=True
+            )
+            return
+
+        self.volume = percent / 100
+        # A pre-buffered next track was encoded at the old volume.
+        await self.discard_prebuffer()
+        vc = self.voice_client
+        source = vc.source if vc else None
+        if isinstance(source, discord.PCMVolumeTransformer):
+            source.volume = self.volume * source.gain
+            await send_message(interaction, f"🔊 볼륨을 {percent}%로 변경했어요.")
+        else:
+            await send_message(
+                interaction, f"🔊 볼륨을 {percent}%로 변경했어요. (다음 곡부터 적용)"
+            )
 
     def get_now_playing_text(self):
         if self.current:
-            title, url, *_ = self.current
-            return f"🎶 현재 재생 중: **[{title}]({url})**"
+            track = self.current
+            return f"🎶 현재 재생 중: **[{track.title}]({track.url})**"
         else:
             return "❌ 현재 재생 중인 곡이 없습니다."
 
+    def is_idle(self):
+        vc = self.voice_client
+        return (
+            not self.queue
+            and not self.current
+            and not self.playing_task
+            and (not vc or not vc.is_connected())
+        )
+
+
+class Music(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.players: dict[int, GuildPlayer] = {}
+        self.sessions_restored = False
+        # Loaded sessions still waiting for their restore; saved as they were until then.
+        self.pending_sessions: dict[int, dict] = {}
+        self.register_metrics()
+
+    def register_metrics(self):
+        Gauge(
+            "cerberus_queue_length",
+            "Queued tracks across all guilds",
+            fn=lambda: sum(len(player.queue) for player in self.players.values()),
+        )
+        Gauge(
+            "cerberus_voice_clients",
+            "Connected voice clients",
+            fn=lambda: len(self.bot.voice_clients),
+        )
+        Gauge(
+            "cerberus_scheduler_waiters",
+            "Jobs waiting for an admission slot",
+            fn=lambda: {
+                (("scheduler", scheduler.name),): scheduler.queue_depth
+                for scheduler in (yt_dlp_scheduler, ffmpeg_scheduler)
+            },
+        )
+        Gauge(
+            "cerberus_scheduler_limit",
+            "Current adaptive concurrency limit",
+            fn=lambda: {
+                (("scheduler", scheduler.name),): scheduler.limit
+                for scheduler in (yt_dlp_scheduler, ffmpeg_scheduler)
+            },
+        )
+        Counter(
+            "cerberus_cache_hits_total",
+            "Cache lookups that skipped yt-dlp or streaming",
+            fn=lambda: {
+                (("cache", "metadata"),): metadata_cache.hits,
+                (("cache", "stream"),): metadata_cache.stream_hits,
+                (("cache", "audio"),): audio_cache.hits,
+            },
+        )
+        Gauge(
+            "cerberus_cache_entries",
+            "Entries held by each cache",
+            fn=lambda: {
+                (("cache", "metadata"),): len(metadata_cache.entries),
+                (("cache", "audio"),): len(audio_cache.entries),
+                (("cache", "loudness"),): len(loudness.gains),
+            },
+        )
+        Gauge(
+            "cerberus_audio_cache_bytes",
+            "Bytes stored in the audio cache",
+            fn=lambda: audio_cache.total_bytes,
+        )
+        Gauge(
+            "cerberus_background_jobs",
+            "Running audio cache downloads and loudness analyses",
+            fn=lambda: {
+                (("job", "download"),): len(audio_cache.downloads),
+                (("job", "loudness"),): len(loudness.tasks),
+            },
+        )
+        Gauge(
+            "cerberus_ytdl_workers_idle",
+            "Idle yt-dlp worker processes",
+            fn=lambda: {
+                (("pool", name),): pool.idle.qsize() if pool.idle else 0
+                for name, pool in YTDL_POOLS
+            },
+        )
+        Counter(
+            "cerberus_ytdl_worker_restarts_total",
+            "yt-dlp worker processes restarted after a crash, timeout or job limit",
+            fn=lambda: {
+                (("pool", name),): pool.restarts
+                for name, pool in YTDL_POOLS
+            },
+        )
+        Counter(
+            "cerberus_cache_misses_total",
+            "Cache lookups that missed",
+            fn=lambda: {
+                (("cache", "metadata"),): metadata_cache.misses,
+                (("cache", "stream"),): metadata_cache.stream_misses,
+                (("cache", "audio"),): audio_cache.misses,
+            },
+        )
+
+    async def cog_load(self):
+        await audio_cache.load()
+        await loudness.load()
+        ffmpeg_supervisor.start()
+
+    async def cog_unload(self):
+        ffmpeg_supervisor.stop()
+        await audio_cache.close()
+        await session_store.close()
+
+    def snapshot_sessions(self) -> dict[int, dict]:
+        sessions = dict(self.pending_sessions)
+        for guild_id, player in self.players.items():
+            session = player.snapshot()
+            if session is not None:
+                sessions[guild_id] = session
+        return sessions
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # on_ready fires again after gateway reconnects; only restore once.
+        if self.sessions_restored:
+            return
+        self.sessions_restored = True
+
+        sessions = await session_store.load()
+        # Sessions stay pending until their staggered restore ran, so saves in the
+        # meantime keep them instead of writing only the guilds restored so far.
+        self.pending_sessions.update(sessions)
+        session_store.start(self.snapshot_sessions)
+        for index, (guild_id, session) in enumerate(sessions.items()):
+            self.bot.loop.create_task(
+                self.restore_session(guild_id, session, index * RESTORE_STAGGER)
+            )
+
+    async def restore_session(self, guild_id: int, session: dict, delay: float):
+        try:
+            await asyncio.sleep(delay)
+            guild = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(session["voice_channel_id"]) if guild else None
+            if channel is None or not any(not m.bot for m in channel.members):
+                return
+
+            player = self.get_player(guild)
+            if player.current or player.queue:
+                return
+            await player.restore(channel, session)
+        except Exception as e:
+            print(f"[WARN] 재생 세션 복원 실패: {guild_id} ({e})")
+        finally:
+            self.pending_sessions.pop(guild_id, None)
+
+    def get_player(self, guild: discord.Guild) -> GuildPlayer:
+        player = self.players.get(guild.id)
+        if player is None:
+            player = GuildPlayer(self.bot, guild)
+            self.players[guild.id] = player
+        return player
+
+    def release_player(self, guild: discord.Guild):
+        player = self.players.get(guild.id)
+        if player and player.is_idle():
+            player.prefetcher.clear()
+            del self.players[guild.id]
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if member.id == self.bot.user.id:
+            if before.channel and not after.channel:
+                self.release_player(member.guild)
+            return
+
+        if member.bot:
+            return
+
+        if before.channel and before.channel != after.channel:
+            vc = member.guild.voice_client
+            if vc and vc.channel == before.channel:
+                self.bot.loop.create_task(
+                    self.get_player(member.guild).check_and_leave_if_alone(
+                        before.channel
+                    )
+                )
+
+    @app_commands.command(name="play", description="유튜브 링크로 음악을 재생합니다.")
+    @app_commands.describe(url="유튜브 비디오 URL")
+    async def play(self, interaction: discord.Interaction, url: str):
+        await self.get_player(interaction.guild).play(interaction, url)
+
+    @app_commands.command(
+        name="playlist", description="유튜브 재생 목록의 곡들을 대기열에 추가합니다."
+    )
+    @app_commands.describe(url="유튜브 재생 목록 URL")
+    async def playlist(self, interaction: discord.Interaction, url: str):
+        await self.get_player(interaction.guild).play_playlist(interaction, url)
+
+    @app_commands.command(name="skip", description="현재 재생 중인 곡을 스킵합니다.")
+    async def skip(self, interaction: discord.Interaction):
+        await self.get_player(interaction.guild).skip(interaction)
+
+    @app_commands.command(name="queue", description="현재 대기열을 확인합니다.")
+    async def queue_command(self, interaction: discord.Interaction):
+        await self.get_player(interaction.guild).show_queue(interaction)
+
+    @app_commands.command(name="remove", description="대기열에서 특정 곡을 제거합니다.")
+    @app_commands.describe(index="제거할 곡 번호 (1부터 시작)")
+    async def remove_command(self, interaction: discord.Interaction, index: int):
+        await self.get_player(interaction.guild).remove(interaction, index)
+
+    @app_commands.command(name="leave", description="봇을 음성 채널에서 나가게 합니다.")
+    async def leave(self, interaction: discord.Interaction):
+        await self.get_player(interaction.guild).leave_channel(interaction)
+
+    @app_commands.command(name="volume", description="재생 볼륨을 변경합니다.")
+    @app_commands.describe(percent="볼륨 (1~200%)")
+    async def volume(self, interaction: discord.Interaction, percent: int):
+        await self.get_player(interaction.guild).set_volume(interaction, percent)
+
     @app_commands.command(
         name="nowplaying", description="현재 재생 중인 곡을 표시합니다."
     )
     async def nowplaying(self, interaction: discord.Interaction):
-        text = self.get_now_playing_text()
+        text = self.get_player(interaction.guild).get_now_playing_text()
         await send_message(interaction, text)
 
 
@@ -0,0 +1,77 @@
+import asyncio
+import os
+
+import discord
+
+from utils.attachments import AttachmentStore
+
+ARCHIVE_WORKERS = int(os.getenv("ARCHIVE_WORKERS", "4"))
+ARCHIVE_QUEUE_SIZE = int(os.getenv("ARCHIVE_QUEUE_SIZE", "200"))
+ARCHIVE_RETRIES = 3
+
+
+class AttachmentArchiver:
+    def __init__(
+        self,
+        store: AttachmentStore,
+        workers: int = ARCHIVE_WORKERS,
+        queue_size: int = ARCHIVE_QUEUE_SIZE,
+        retries: int = ARCHIVE_RETRIES,
+    ):
+        self.store = store
+        self.workers = workers
+        self.retries = retries
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.tasks: list[asyncio.Task] = []
+        self.dropped = 0
+
+    def start(self):
+        if self.tasks:
+            return
+        self.tasks = [
+            asyncio.create_task(self.worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+
+    def enqueue(self, message_id: int, attachment: discord.Attachment) -> bool:
+        try:
+            self.queue.put_nowait((message_id, attachment))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"Archive queue is full, skipped: {attachment.filename}")
+            return False
+
+    async def worker(self):
+        while True:
+            message_id, attachment = await self.queue.get()
+            try:
+                await self.save(message_id, attachment)
+            except Exception as e:
+                print(f"Error saving image: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def save(self, message_id: int, attachment: discord.Attachment):
+        for attempt in range(self.retries):
+            try:
+                data = await attachment.read()
+                digest = await self.store.put(
+                    message_id, attachment.id, attachment.filename, data
+                )
+                print(f"Image uploaded and saved as: {digest}")
+                return True
+            except discord.NotFound:
+                print(f"Attachment no longer exists: {attachment.url}")
+                return False
+            except (discord.HTTPException, OSError) as e:
+                if attempt < self.retries - 1:
+                    await asyncio.sleep(2**attempt)
+                else:
+                    print(f"Error saving image: {e}")
+        return False
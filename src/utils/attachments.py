@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+IMAGE_DIRECTORY = os.getenv("IMAGE_DIRECTORY", "./images")
+ATTACHMENT_QUOTA_BYTES = int(
+    os.getenv("ATTACHMENT_QUOTA_BYTES", str(1024 * 1024 * 1024))
+)
+ATTACHMENT_MAX_AGE_DAYS = int(os.getenv("ATTACHMENT_MAX_AGE_DAYS", "30"))
+INDEX_FILE = "index.sqlite3"
+EVICT_INTERVAL = 60 * 60
+# Files archived before the index existed were named {message_id}{attachment_id}.ext.
+LEGACY_NAME_PATTERN = re.compile(r"^\d+\.\w+$")
+LEGACY_MESSAGE_ID = 0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attachments (
+    message_id INTEGER NOT NULL,
+    attachment_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    created_at REAL NOT NULL,
+    PRIMARY KEY (message_id, attachment_id)
+);
+CREATE INDEX IF NOT EXISTS attachments_created_at ON attachments(created_at);
+"""
+
+
+def write_file(path: str, data: bytes):
+    temp_path = path + ".part"
+    with open(temp_path, "wb", buffering=1024 * 1024) as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class AttachmentStore:
+    def __init__(
+        self,
+        directory: str = IMAGE_DIRECTORY,
+        quota_bytes: int = ATTACHMENT_QUOTA_BYTES,
+        max_age_days: int = ATTACHMENT_MAX_AGE_DAYS,
+    ):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.conn: Optional[sqlite3.Connection] = None
+        # sqlite3 connections are used from a single dedicated thread.
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="attachment-store"
+        )
+        self.total_bytes = 0
+        self.last_evicted_at = 0.0
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.directory, INDEX_FILE))
+        self.conn.executescript(SCHEMA)
+        self._migrate_legacy()
+        self.total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()[0]
+        self._evict()
+
+    def _migrate_legacy(self):
+        """Index files saved under the old naming so eviction covers them too.
+
+        The two IDs in a legacy name can't be split apart again, so these files are
+        filed under message 0 with their modification time as the creation time.
+        """
+        known = {path for (path,) in self.conn.execute("SELECT path FROM blobs")}
+        names = [
+            name
+            for name in os.listdir(self.directory)
+            if LEGACY_NAME_PATTERN.match(name)
+            and os.path.join(self.directory, name) not in known
+        ]
+        if not names:
+            return
+
+        with self.conn:
+            next_id = self.conn.execute(
+                "SELECT COALESCE(MAX(attachment_id), 0) + 1 FROM attachments "
+                "WHERE message_id = ?",
+                (LEGACY_MESSAGE_ID,),
+            ).fetchone()[0]
+            for name in names:
+                path = os.path.join(self.directory, name)
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                created_at = os.path.getmtime(path)
+
+                row = self.conn.execute(
+                    "SELECT path FROM blobs WHERE hash = ?", (digest,)
+                ).fetchone()
+                if row:
+                    self.conn.execute(
+                        "UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (digest,)
+                    )
+                    os.remove(path)
+                else:
+                    self.conn.execute(
+                        "INSERT INTO blobs (hash, path, size, refs) VALUES (?, ?, ?, 1)",
+                        (digest, path, os.path.getsize(path)),
+                    )
+                self.conn.execute(
+                    "INSERT INTO attachments "
+                    "(message_id, attachment_id, filename, hash, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (LEGACY_MESSAGE_ID, next_id, name, digest, created_at),
+                )
+                next_id += 1
+        print(f"기존 첨부파일 {len(names)}개를 인덱스에 등록했습니다.")
+
+    def _close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def _put(self, message_id: int, attachment_id: int, filename: str, data: bytes):
+        digest = hashlib.sha256(data).hexdigest()
+        extension = os.path.splitext(filename)[1].lower()
+
+        with self.conn:
+            existing = self.conn.execute(
+                "SELECT hash FROM attachments WHERE message_id = ? AND attachment_id = ?",
+                (message_id, attachment_id),
+            ).fetchone()
+            if existing and existing[0] == digest:
+                return digest
+            if existing:
+                # Release the blob the replaced row pointed at before re-pointing it.
+                self._release([(message_id, attachment_id, existing[0])])
+
+            row = self.conn.execute(
+                "SELECT path FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+            if row and os.path.isfile(row[0]):
+                self.conn.execute(
+                    "UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (digest,)
+                )
+            else:
+                path = os.path.join(self.directory, f"{digest}{extension}")
+                write_file(path, data)
+                if row:
+                    self.conn.execute(
+                        "UPDATE blobs SET path = ?, refs = refs + 1 WHERE hash = ?",
+                        (path, digest),
+                    )
+                else:
+                    self.conn.execute(
+                        "INSERT INTO blobs (hash, path, size, refs) VALUES (?, ?, ?, 1)",
+                        (digest, path, len(data)),
+                    )
+                    self.total_bytes += len(data)
+
+            self.conn.execute(
+                "INSERT INTO attachments "
+                "(message_id, attachment_id, filename, hash, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (message_id, attachment_id, filename, digest, time.time()),
+            )
+
+        if (
+            self.total_bytes > self.quota_bytes
+            or time.time() - self.last_evicted_at > EVICT_INTERVAL
+        ):
+            self._evict()
+        return digest
+
+    def _get(self, message_id: int):
+        rows = self.conn.execute(
+            "SELECT a.filename, b.path FROM attachments a "
+            "JOIN blobs b ON a.hash = b.hash WHERE a.message_id = ? "
+            "ORDER BY a.attachment_id",
+            (message_id,),
+        ).fetchall()
+        return [(filename, path) for filename, path in rows if os.path.isfile(path)]
+
+    def _release(self, rows):
+        for message_id, attachment_id, digest in rows:
+            self.conn.execute(
+                "DELETE FROM attachments WHERE message_id = ? AND attachment_id = ?",
+                (message_id, attachment_id),
+            )
+            self.conn.execute(
+                "UPDATE blobs SET refs = refs - 1 WHERE hash = ?", (digest,)
+            )
+
+        orphans = self.conn.execute(
+            "SELECT hash, path, size FROM blobs WHERE refs <= 0"
+        ).fetchall()
+        for digest, path, size in orphans:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.conn.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+            self.total_bytes -= size
+
+    def _evict(self):
+        self.last_evicted_at = time.time()
+        with self.conn:
+            expired = self.conn.execute(
+                "SELECT message_id, attachment_id, hash FROM attachments "
+                "WHERE created_at < ?",
+                (time.time() - self.max_age,),
+            ).fetchall()
+            self._release(expired)
+
+            while self.total_bytes > self.quota_bytes:
+                oldest = self.conn.execute(
+                    "SELECT message_id, attachment_id, hash FROM attachments "
+                    "ORDER BY created_at LIMIT 32"
+                ).fetchall()
+                if not oldest:
+                    break
+                for row in oldest:
+                    self._release([row])
+                    if self.total_bytes <= self.quota_bytes:
+                        break
+
+    async def open(self):
+        await self._run(self._open)
+
+    async def close(self):
+        await self._run(self._close)
+        self.executor.shutdown(wait=False)
+
+    async def put(
+        self, message_id: int, attachment_id: int, filename: str, data: bytes
+    ):
+        return await self._run(self._put, message_id, attachment_id, filename, data)
+
+    async def get(self, message_id: int) -> list[tuple[str, str]]:
+        return await self._run(self._get, message_id)
+
+    async def evict(self):
+        await self._run(self._evict)
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.cache import get_cache_key
+from utils.cookie import cookie_snapshot
+from utils.worker import background_pool
+from utils.ytdl import get_ytdl_options
+
+load_dotenv()
+
+AUDIO_CACHE_DIRECTORY = os.getenv("AUDIO_CACHE_DIRECTORY", "./audio_cache")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(2 * 1024**3)))
+AUDIO_CACHE_ADMIT_PLAYS = int(os.getenv("AUDIO_CACHE_ADMIT_PLAYS", "3"))
+AUDIO_CACHE_MAX_TRACKED = 4096
+# Play counts are saved at most this often, so admission progress survives restarts.
+AUDIO_CACHE_SAVE_DELAY = 60
+INDEX_FILE = "index.json"
+
+
+class AudioCache:
+    def __init__(
+        self,
+        directory: str = AUDIO_CACHE_DIRECTORY,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        admit_plays: int = AUDIO_CACHE_ADMIT_PLAYS,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.admit_plays = admit_plays
+        self.entries: OrderedDict[str, dict] = OrderedDict()
+        self.play_counts: OrderedDict[str, int] = OrderedDict()
+        self.downloads: dict[str, asyncio.Task] = {}
+        self.save_task: Optional[asyncio.Task] = None
+        # One download at a time keeps a background worker free for playlist listings.
+        self.download_lock = asyncio.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _read_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.isfile(self.index_path):
+            return {}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index: dict):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(temp_path, self.index_path)
+
+    async def load(self):
+        try:
+            index = await asyncio.to_thread(self._read_index)
+        except Exception as e:
+            print(f"[WARN] 오디오 캐시 인덱스 로드 실패: {e}")
+            index = {}
+
+        entries = sorted(
+            index.get("entries", {}).items(), key=lambda item: item[1]["last_played"]
+        )
+        for key, entry in entries:
+            if os.path.isfile(entry["path"]):
+                self.entries[key] = entry
+                self.total_bytes += entry["size"]
+        self.play_counts.update(index.get("play_counts", {}))
+        print(f"오디오 캐시 로드 완료: {len(self.entries)}곡, {self.total_bytes} bytes")
+
+    async def save(self):
+        index = {
+            "entries": dict(self.entries),
+            "play_counts": dict(self.play_counts),
+        }
+        try:
+            await asyncio.to_thread(self._write_index, index)
+        except Exception as e:
+            print(f"[WARN] 오디오 캐시 인덱스 저장 실패: {e}")
+
+    def lookup(self, url: str) -> Optional[dict]:
+        key = get_cache_key(url)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if not os.path.isfile(entry["path"]):
+            self.total_bytes -= entry["size"]
+            del self.entries[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["last_played"] = time.time()
+        self.entries.move_to_end(key)
+        return entry
+
+    def record_play(self, url: str):
+        key = get_cache_key(url)
+        count = self.play_counts.pop(key, 0) + 1
+        self.play_counts[key] = count
+        while len(self.play_counts) > AUDIO_CACHE_MAX_TRACKED:
+            self.play_counts.popitem(last=False)
+        if self.save_task is None:
+            self.save_task = asyncio.create_task(self.save_later())
+
+        if (
+            count >= self.admit_plays
+            and key not in self.entries
+            and key not in self.downloads
+        ):
+            self.downloads[key] = asyncio.create_task(self.download(key, url))
+
+    async def save_later(self):
+        try:
+            await asyncio.sleep(AUDIO_CACHE_SAVE_DELAY)
+        finally:
+            self.save_task = None
+        await self.save()
+
+    async def close(self):
+        if self.save_task:
+            self.save_task.cancel()
+        await self.save()
+
+    async def download(self, key: str, url: str):
+        try:
+            async with self.download_lock:
+                options = get_ytdl_options(cookie_snapshot.path())
+                options["outtmpl"] = os.path.join(self.directory, "%(id)s.%(ext)s")
+                result = await background_pool.submit(
+                    "extract", options=options, url=url, download=True, timeout=600
+                )
+
+            filename = result["filename"]
+            size = os.path.getsize(filename)
+            if size > self.max_bytes:
+                os.remove(filename)
+                return
+
+            info = result["info"]
+            self.entries[key] = {
+                "path": filename,
+                "size": size,
+                "acodec": info.get("acodec"),
+                "last_played": time.time(),
+            }
+            self.total_bytes += size
+            self.evict()
+            await self.save()
+            print(f"오디오 캐시 저장 완료: {info.get('title')} ({size} bytes)")
+        except Exception as e:
+            print(f"[WARN] 오디오 캐시 다운로드 실패: {e}")
+        finally:
+            self.downloads.pop(key, None)
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry["size"]
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+
+
+audio_cache = AudioCache()
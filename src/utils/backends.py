@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.cookie import cookie_snapshot
+from utils.metrics import Counter, Gauge, extraction_seconds
+from utils.semaphore import Priority, yt_dlp_scheduler
+from utils.worker import ExtractionError, ytdl_pool
+from utils.ytdl import get_ytdl_options
+
+load_dotenv()
+
+BACKEND_WINDOW = 50
+BACKEND_MIN_SAMPLES = 5
+BACKEND_STALE_AFTER = 300
+HEDGE_MIN_DELAY = 0.5
+HEDGE_MAX_DELAY = 10.0
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "3"))
+
+hedges_total = Counter(
+    "cerberus_hedged_extractions_total", "Hedged second extraction requests"
+)
+
+
+class ExtractionBackend(ABC):
+    name = "backend"
+    timeout = 30.0
+
+    def __init__(self, window: int = BACKEND_WINDOW):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.last_used = 0.0
+
+    @abstractmethod
+    async def fetch(self, url: str) -> dict: ...
+
+    async def extract(self, url: str) -> dict:
+        start = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(self.fetch(url), timeout=self.timeout)
+        except asyncio.CancelledError:
+            # The caller gave up; that says nothing about this backend.
+            raise
+        except Exception:
+            self.record(time.perf_counter() - start, ok=False)
+            raise
+        elapsed = time.perf_counter() - start
+        self.record(elapsed, ok=True)
+        extraction_seconds.observe(elapsed, backend=self.name)
+        return data["entries"][0] if "entries" in data else data
+
+    def record(self, elapsed: float, ok: bool):
+        self.last_used = time.monotonic()
+        self.latencies.append(elapsed)
+        self.outcomes.append(ok)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.latencies) < BACKEND_MIN_SAMPLES:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)]
+
+    @property
+    def success_rate(self) -> float:
+        if not self.outcomes:
+            return 1.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def score(self) -> float:
+        # Expected time to a successful result. Backends without enough samples, or
+        # whose samples are stale, score zero so they get tried again.
+        p50 = self.percentile(0.5)
+        if p50 is None or time.monotonic() - self.last_used > BACKEND_STALE_AFTER:
+            return 0.0
+        return p50 / max(self.success_rate, 0.05)
+
+
+class CLIBackend(ExtractionBackend):
+    name = "cli"
+    timeout = 30.0
+
+    async def fetch(self, url: str) -> dict:
+        cookiefile = cookie_snapshot.path()
+        args = [
+            "--no-check-certificate",
+            "--skip-download",
+            "--no-playlist",
+            "-f",
+            "bestaudio/best",
+        ]
+        if cookiefile:
+            args += ["--cookies", cookiefile]
+
+        result = await ytdl_pool.submit("cli", args=args, url=url)
+        return result["info"]
+
+
+class APIBackend(ExtractionBackend):
+    name = "api"
+    timeout = 20.0
+
+    async def fetch(self, url: str) -> dict:
+        options = get_ytdl_options(cookie_snapshot.path())
+        options.update(
+            {
+                "skip_download": True,
+                "noplaylist": True,
+                "no_check_certificate": True,
+                "quiet": True,
+                "no_warnings": True,
+            }
+        )
+
+        result = await ytdl_pool.submit("extract", options=options, url=url)
+        return result["info"]
+
+
+class BackendRouter:
+    def __init__(self, backends: list[ExtractionBackend]):
+        self.backends = backends
+        Gauge(
+            "cerberus_backend_latency_p95_seconds",
+            "Rolling p95 extraction latency per backend",
+            fn=lambda: {
+                (("backend", b.name),): b.percentile(0.95) or 0 for b in self.backends
+            },
+        )
+        Gauge(
+            "cerberus_backend_success_ratio",
+            "Rolling extraction success rate per backend",
+            fn=lambda: {(("backend", b.name),): b.success_rate for b in self.backends},
+        )
+
+    def ranked(self) -> list[ExtractionBackend]:
+        return sorted(self.backends, key=lambda backend: backend.score())
+
+    @staticmethod
+    def hedge_delay(backend: ExtractionBackend) -> float:
+        p95 = backend.percentile(0.95)
+        if p95 is None:
+            return HEDGE_DEFAULT_DELAY
+        return min(max(p95, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+    async def attempt(
+        self, backend: ExtractionBackend, url: str, guild_id: int, priority: Priority
+    ) -> dict:
+        async with yt_dlp_scheduler.slot(guild_id, priority):
+            return await backend.extract(url)
+
+    async def extract(
+        self, url: str, guild_id: int = 0, priority: Priority = Priority.METADATA
+    ) -> dict:
+        backends = deque(self.ranked())
+        primary = backends.popleft()
+        pending = {asyncio.create_task(self.attempt(primary, url, guild_id, priority))}
+        delay = self.hedge_delay(primary)
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                delay = None
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+
+                if not backends:
+                    continue
+                if not pending:
+                    # Fall back to the next backend after a failure.
+                    backend = backends.popleft()
+                elif not done and yt_dlp_scheduler.active < yt_dlp_scheduler.limit:
+                    # The primary is slower than its p95: hedge, but only into spare
+                    # capacity so hedges never delay queued requests.
+                    backend = backends.popleft()
+                    hedges_total.inc(backend=backend.name)
+                else:
+                    continue
+                pending.add(
+                    asyncio.create_task(self.attempt(backend, url, guild_id, priority))
+                )
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            for task in pending:
+                # A losing request finishes in the background: cancelling it would
+                # restart its worker, and its latency still feeds the rolling stats.
+                task.add_done_callback(
+                    lambda task: task.cancelled() or task.exception()
+                )
+
+        error = errors[-1]
+        if isinstance(error, (asyncio.TimeoutError, ExtractionError)):
+            raise error
+        raise ExtractionError(str(error)) from error
+
+
+metadata_router = BackendRouter([APIBackend(), CLIBackend()])
@@ -0,0 +1,166 @@
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METADATA_CACHE_SIZE = int(os.getenv("METADATA_CACHE_SIZE", "512"))
+METADATA_TTL = int(os.getenv("METADATA_TTL", str(60 * 60 * 24 * 7)))
+STREAM_FALLBACK_TTL = 60 * 30
+STREAM_EXPIRY_MARGIN = 60
+
+STATIC_FIELDS = (
+    "id",
+    "title",
+    "duration",
+    "is_live",
+    "webpage_url",
+    "extractor",
+)
+STREAM_FIELDS = (
+    "url",
+    "http_headers",
+    "ext",
+    "acodec",
+    "abr",
+    "asr",
+)
+
+VIDEO_ID_PATTERN = re.compile(
+    r"(?:youtu\.be/|/shorts/|/live/|/embed/|/v/|[?&]v=)([0-9A-Za-z_-]{11})"
+)
+EXPIRE_PATH_PATTERN = re.compile(r"/expire/(\d+)")
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    match = VIDEO_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    return None
+
+
+def get_cache_key(url: str) -> str:
+    return extract_video_id(url) or url
+
+
+def get_stream_expiry(stream_url: Optional[str]) -> Optional[float]:
+    if not stream_url:
+        return None
+
+    query = parse_qs(urlparse(stream_url).query)
+    expire = query.get("expire")
+    if expire:
+        try:
+            return float(expire[0])
+        except ValueError:
+            return None
+
+    match = EXPIRE_PATH_PATTERN.search(stream_url)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def is_stream_valid(data: Optional[dict], margin: float = STREAM_EXPIRY_MARGIN):
+    if not data or not data.get("url"):
+        return False
+    expires_at = get_stream_expiry(data["url"])
+    if expires_at is None:
+        return False
+    return expires_at - margin > time.time()
+
+
+class CacheEntry:
+    __slots__ = ("static", "stream", "stored_at", "stream_expires_at")
+
+    def __init__(self, static: dict, stream: Optional[dict], expires_at: float):
+        self.static = static
+        self.stream = stream
+        self.stored_at = time.time()
+        self.stream_expires_at = expires_at
+
+
+class MetadataCache:
+    def __init__(
+        self,
+        max_size: int = METADATA_CACHE_SIZE,
+        ttl: float = METADATA_TTL,
+        stream_margin: float = STREAM_EXPIRY_MARGIN,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stream_margin = stream_margin
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stream_hits = 0
+        self.stream_misses = 0
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.stored_at > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def get(self, url: str) -> Optional[dict]:
+        entry = self._lookup(get_cache_key(url))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(entry.static)
+
+    def get_stream(self, url: str) -> Optional[dict]:
+        entry = self._lookup(get_cache_key(url))
+        if (
+            entry is None
+            or entry.stream is None
+            or entry.stream_expires_at - self.stream_margin <= time.time()
+        ):
+            self.stream_misses += 1
+            return None
+        self.stream_hits += 1
+        return {**entry.static, **entry.stream}
+
+    def put(self, url: str, data: dict):
+        if not data:
+            return
+
+        key = data.get("id") or get_cache_key(url)
+        static = {field: data.get(field) for field in STATIC_FIELDS}
+
+        stream = None
+        expires_at = 0.0
+        if data.get("url") and not data.get("is_live"):
+            stream = {field: data.get(field) for field in STREAM_FIELDS}
+            expires_at = get_stream_expiry(data["url"]) or (
+                time.time() + STREAM_FALLBACK_TTL
+            )
+
+        entry = self.entries.get(key)
+        if entry is not None and stream is None and entry.stream is not None:
+            stream, expires_at = entry.stream, entry.stream_expires_at
+
+        self.entries[key] = CacheEntry(static, stream, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate_stream(self, url: str):
+        entry = self.entries.get(get_cache_key(url))
+        if entry is not None:
+            entry.stream = None
+            entry.stream_expires_at = 0.0
+
+
+metadata_cache = MetadataCache()
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import signal
+import sys
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.attachments import ATTACHMENT_QUOTA_BYTES, IMAGE_DIRECTORY
+from utils.audiocache import AUDIO_CACHE_DIRECTORY, AUDIO_CACHE_MAX_BYTES
+from utils.loudness import LOUDNESS_FILE
+from utils.metrics import METRICS_PORT
+from utils.session import SESSION_FILE
+
+load_dotenv()
+
+# CLUSTER_COUNT processes split SHARD_COUNT gateway shards between them. Unset
+# SHARD_COUNT keeps the single-process, unsharded bot.
+CLUSTER_COUNT = int(os.getenv("CLUSTER_COUNT", "1"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or (
+    CLUSTER_COUNT if CLUSTER_COUNT > 1 else None
+)
+CLUSTER_ID = os.getenv("CLUSTER_ID")
+# Discord allows one IDENTIFY per 5 seconds per bot (max_concurrency 1).
+IDENTIFY_INTERVAL = 5.5
+RESTART_BACKOFF_BASE = 2.0
+RESTART_BACKOFF_MAX = 120.0
+# A cluster that stayed up this long is considered healthy again.
+STABLE_UPTIME = 300.0
+SHUTDOWN_TIMEOUT = 15.0
+
+
+def cluster_shard_ids(
+    cluster_id: int, cluster_count: int, shard_count: int
+) -> list[int]:
+    return [
+        shard for shard in range(shard_count) if shard % cluster_count == cluster_id
+    ]
+
+
+def is_supervisor() -> bool:
+    return CLUSTER_COUNT > 1 and CLUSTER_ID is None
+
+
+def is_cluster_process() -> bool:
+    return CLUSTER_ID is not None
+
+
+def current_cluster() -> tuple[int, Optional[list[int]]]:
+    """Cluster ID and shard IDs this process should connect, or None for all."""
+    if SHARD_COUNT is None:
+        return 0, None
+    cluster_id = int(CLUSTER_ID or 0)
+    return cluster_id, cluster_shard_ids(cluster_id, CLUSTER_COUNT, SHARD_COUNT)
+
+
+class ClusterSupervisor:
+    def __init__(
+        self,
+        script: str,
+        cluster_count: int = CLUSTER_COUNT,
+        shard_count: Optional[int] = SHARD_COUNT,
+    ):
+        self.script = script
+        self.cluster_count = cluster_count
+        self.shard_count = shard_count or cluster_count
+        self.processes: dict[int, asyncio.subprocess.Process] = {}
+        self.stopping = asyncio.Event()
+
+    def cluster_env(self, cluster_id: int) -> dict:
+        # Guilds map to the same shard and cluster on every start, so per-cluster
+        # cache files stay warm across restarts without processes racing on them.
+        # Disk budgets are split so N clusters together stay within the configured size.
+        loudness_root, loudness_ext = os.path.splitext(LOUDNESS_FILE)
+        session_root, session_ext = os.path.splitext(SESSION_FILE)
+        env = os.environ.copy()
+        env.update(
+            {
+                "CLUSTER_ID": str(cluster_id),
+                "CLUSTER_COUNT": str(self.cluster_count),
+                "SHARD_COUNT": str(self.shard_count),
+                "METRICS_PORT": str(METRICS_PORT + cluster_id),
+                "AUDIO_CACHE_DIRECTORY": os.path.join(
+                    AUDIO_CACHE_DIRECTORY, f"cluster-{cluster_id}"
+                ),
+                "AUDIO_CACHE_MAX_BYTES": str(
+                    AUDIO_CACHE_MAX_BYTES // self.cluster_count
+                ),
+                "IMAGE_DIRECTORY": os.path.join(
+                    IMAGE_DIRECTORY, f"cluster-{cluster_id}"
+                ),
+                "ATTACHMENT_QUOTA_BYTES": str(
+                    ATTACHMENT_QUOTA_BYTES // self.cluster_count
+                ),
+                "LOUDNESS_FILE": f"{loudness_root}-cluster-{cluster_id}{loudness_ext}",
+                "SESSION_FILE": f"{session_root}-cluster-{cluster_id}{session_ext}",
+            }
+        )
+        return env
+
+    async def run_cluster(self, cluster_id: int):
+        shards = cluster_shard_ids(cluster_id, self.cluster_count, self.shard_count)
+        # Stagger the first start so clusters don't IDENTIFY at the same time.
+        await self.wait_stopping(cluster_id * len(shards) * IDENTIFY_INTERVAL)
+
+        failures = 0
+        while not self.stopping.is_set():
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, self.script, env=self.cluster_env(cluster_id)
+            )
+            self.processes[cluster_id] = process
+            print(f"클러스터 {cluster_id} 시작 (PID {process.pid}, 샤드 {shards})")
+
+            code = await process.wait()
+            if self.stopping.is_set():
+                break
+            if code == 0:
+                print(f"클러스터 {cluster_id} 정상 종료")
+                break
+
+            if time.monotonic() - started > STABLE_UPTIME:
+                failures = 0
+            failures += 1
+            delay = min(RESTART_BACKOFF_BASE * 2 ** (failures - 1), RESTART_BACKOFF_MAX)
+            print(
+                f"[WARN] 클러스터 {cluster_id} 비정상 종료 (code {code}), "
+                f"{delay:.0f}초 후 재시작"
+            )
+            await self.wait_stopping(delay)
+
+    async def wait_stopping(self, timeout: float):
+        try:
+            await asyncio.wait_for(self.stopping.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self):
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        for process in self.processes.values():
+            if process.returncode is None:
+                process.terminate()
+        asyncio.get_running_loop().call_later(SHUTDOWN_TIMEOUT, self.kill)
+
+    def kill(self):
+        for cluster_id, process in self.processes.items():
+            if process.returncode is None:
+                print(f"[WARN] 클러스터 {cluster_id} 강제 종료")
+                process.kill()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:
+                # Windows event loops have no signal handlers; Ctrl+C still
+                # reaches the children directly through the console.
+                break
+
+        print(
+            f"✅ 클러스터 감독 시작: 프로세스 {self.cluster_count}개, "
+            f"샤드 {self.shard_count}개"
+        )
+        await asyncio.gather(
+            *(self.run_cluster(cluster_id) for cluster_id in range(self.cluster_count))
+        )
@@ -1,59 +1,122 @@
+import hashlib
 import os
-import shutil
 import tempfile
+from typing import Optional
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-temp_cookie_path = None
+COOKIE_SNAPSHOT_DIR = os.getenv(
+    "COOKIE_SNAPSHOT_DIR",
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+)
 
 
-class TemporaryCookie:
-    def __init__(self):
-        self.cookie_path = os.getenv("COOKIEFILE")
-        self.temp_path = None
+def normalize_cookie_line(line: str) -> Optional[str]:
+    if line.startswith("#") or line.strip() == "":
+        return line
 
-    def __enter__(self):
-        if self.cookie_path and os.path.isfile(self.cookie_path):
-            temp_cookie = tempfile.NamedTemporaryFile(delete=False, suffix=".txt")
-            shutil.copyfile(self.cookie_path, temp_cookie.name)
-            # fix_netscape_cookie_format(temp_cookie.name, temp_cookie.name)
-            self.temp_path = temp_cookie.name
-            return self.temp_path
+    parts = line.strip().split("\t")
+    if len(parts) != 7:
+        print(f"[경고] 잘못된 형식으로 무시됨: {line.strip()}")
         return None
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.temp_path and os.path.isfile(self.temp_path):
-            try:
-                os.remove(self.temp_path)
-                print(f"[DEBUG] 쿠키 삭제됨: {self.temp_path}")
-            except Exception as e:
-                print(f"[WARN] 쿠키 삭제 실패: {e}")
+    domain = parts[0]
+    domain_flag = "TRUE" if domain.startswith(".") else "FALSE"
+    parts[1] = domain_flag
+
+    try:
+        parts[4] = str(int(float(parts[4])))
+    except ValueError:
+        print(f"[경고] expires 변환 실패: {parts[4]}")
+        return None
+
+    return "\t".join(parts) + "\n"
 
 
 def fix_netscape_cookie_format(input_path: str, output_path: str) -> None:
-    with open(input_path, "r", encoding="utf-8") as f_in, open(
-        output_path, "w", encoding="utf-8"
-    ) as f_out:
-        for line in f_in:
-            if line.startswith("#") or line.strip() == "":
-                f_out.write(line)
-                continue
-
-            parts = line.strip().split("\t")
-            if len(parts) != 7:
-                print(f"[경고] 잘못된 형식으로 무시됨: {line.strip()}")
-                continue
-
-            domain = parts[0]
-            domain_flag = "TRUE" if domain.startswith(".") else "FALSE"
-            parts[1] = domain_flag
+    with open(input_path, "r", encoding="utf-8") as f_in:
+        lines = [normalize_cookie_line(line) for line in f_in]
+    with open(output_path, "w", encoding="utf-8") as f_out:
+        f_out.writelines(line for line in lines if line is not None)
+
+
+class CookieSnapshot:
+    """Validated copy of COOKIEFILE, rewritten only when the source changes.
+
+    Snapshots are named after their content hash, so the path handed to the
+    yt-dlp workers stays the same (and their cached YoutubeDL instances stay
+    warm) until the cookies actually change.
+    """
+
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        directory: str = COOKIE_SNAPSHOT_DIR,
+    ):
+        self.source = source if source is not None else os.getenv("COOKIEFILE")
+        self.directory = directory
+        self.content: Optional[str] = None
+        self.snapshot_path: Optional[str] = None
+        self.previous_path: Optional[str] = None
+        self.signature: Optional[tuple] = None
 
+    def path(self) -> Optional[str]:
+        if not self.source:
+            return None
+        try:
+            stat = os.stat(self.source)
+        except FileNotFoundError:
+            return self.snapshot_path
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self.signature:
+            self.signature = signature
             try:
-                parts[4] = str(int(float(parts[4])))
-            except ValueError:
-                print(f"[경고] expires 변환 실패: {parts[4]}")
-                continue
+                self.reload()
+            except OSError as e:
+                print(f"[WARN] 쿠키 파일 갱신 실패: {e}")
+        return self.snapshot_path
+
+    def reload(self):
+        with open(self.source, "r", encoding="utf-8") as f:
+            lines = [normalize_cookie_line(line) for line in f]
+        content = "".join(line for line in lines if line is not None)
+        if content == self.content:
+            return
+
+        digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+        path = os.path.join(
+            self.directory, f"cerberus-cookies-{os.getpid()}-{digest}.txt"
+        )
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+        # Keep one older snapshot around for jobs that were queued with its path.
+        if self.previous_path != path:
+            self.remove(self.previous_path)
+        self.previous_path, self.snapshot_path = self.snapshot_path, path
+        self.content = content
+        print(f"[DEBUG] 쿠키 스냅샷 갱신: {path}")
+
+    @staticmethod
+    def remove(path: Optional[str]):
+        if path and os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"[WARN] 쿠키 삭제 실패: {e}")
+
+    def close(self):
+        self.remove(self.previous_path)
+        self.remove(self.snapshot_path)
+        self.previous_path = self.snapshot_path = None
+        self.content = None
+        self.signature = None
+
 
-            f_out.write("\t".join(parts) + "\n")
+cookie_snapshot = CookieSnapshot()
@@ -1,16 +1,206 @@
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+from weakref import WeakKeyDictionary
 
 import psycopg2
 from dotenv import load_dotenv
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 load_dotenv()
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+HEALTH_CHECK_INTERVAL = 60
+BATCH_SIZE = 100
+BATCH_INTERVAL = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS play_history (
+    id BIGSERIAL PRIMARY KEY,
+    guild_id BIGINT NOT NULL,
+    video_id TEXT NOT NULL,
+    title TEXT,
+    requester_id BIGINT,
+    played_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS deletion_log (
+    id BIGSERIAL PRIMARY KEY,
+    message_id BIGINT NOT NULL,
+    channel_id BIGINT NOT NULL,
+    author_id BIGINT,
+    content TEXT,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+
+def get_connection_kwargs():
+    return {
+        "dbname": os.getenv("DB_NAME"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT"),
+    }
+
 
 def connect_to_db():
-    return psycopg2.connect(
-        dbname=os.getenv("DB_NAME"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT"),
-    )
+    return psycopg2.connect(**get_connection_kwargs())
+
+
+class Database:
+    def __init__(self, size: int = DB_POOL_SIZE):
+        self.size = size
+        self.pool: Optional[ThreadedConnectionPool] = None
+        # One thread per connection, so the pool can never be exhausted.
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="db")
+        # Keyed by the connection itself: a new connection can reuse a closed one's id().
+        self.checked_at: WeakKeyDictionary = WeakKeyDictionary()
+        self.play_history = BatchWriter(
+            self, "play_history", ("guild_id", "video_id", "title", "requester_id")
+        )
+        self.deletion_log = BatchWriter(
+            self, "deletion_log", ("message_id", "channel_id", "author_id", "content")
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _open(self):
+        # minconn == maxconn: the pool closes returned connections beyond minconn.
+        self.pool = ThreadedConnectionPool(
+            self.size, self.size, **get_connection_kwargs()
+        )
+        self._with_connection(lambda cursor: cursor.execute(SCHEMA))
+
+    def _close(self):
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+
+    def _discard(self, conn):
+        self.checked_at.pop(conn, None)
+        self.pool.putconn(conn, close=True)
+
+    def _checkout(self):
+        conn = self.pool.getconn()
+        if conn.closed:
+            self._discard(conn)
+            conn = self.pool.getconn()
+
+        if time.monotonic() - self.checked_at.get(conn, 0) > HEALTH_CHECK_INTERVAL:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                self._discard(conn)
+                conn = self.pool.getconn()
+            self.checked_at[conn] = time.monotonic()
+        return conn
+
+    def _with_connection(self, func, retry: bool = True):
+        conn = self._checkout()
+        try:
+            with conn.cursor() as cursor:
+                result = func(cursor)
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self._discard(conn)
+            if retry:
+                return self._with_connection(func, retry=False)
+            raise
+        except Exception:
+            conn.rollback()
+            self.pool.putconn(conn)
+            raise
+        self.pool.putconn(conn)
+        return result
+
+    async def open(self):
+        await self._run(self._open)
+        self.play_history.start()
+        self.deletion_log.start()
+        print(f"✅ DB 연결 풀 준비 완료 (최대 {self.size}개)")
+
+    async def close(self):
+        await self.play_history.stop()
+        await self.deletion_log.stop()
+        await self._run(self._close)
+        self.executor.shutdown(wait=False)
+
+    async def execute(self, query: str, params: Sequence = ()):
+        await self._run(self._with_connection, lambda c: c.execute(query, params))
+
+    async def fetch(self, query: str, params: Sequence = ()):
+        def job(cursor):
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+        return await self._run(self._with_connection, job)
+
+    async def insert_many(
+        self, table: str, columns: Sequence[str], rows: Sequence[Sequence]
+    ):
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        await self._run(
+            self._with_connection,
+            lambda cursor: execute_values(cursor, query, rows, page_size=BATCH_SIZE),
+        )
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        db: Database,
+        table: str,
+        columns: Sequence[str],
+        batch_size: int = BATCH_SIZE,
+        interval: float = BATCH_INTERVAL,
+    ):
+        self.db = db
+        self.table = table
+        self.columns = columns
+        self.batch_size = batch_size
+        self.interval = interval
+        self.rows: list[tuple] = []
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        await self.flush()
+
+    def add(self, *row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.wakeup.set()
+
+    async def flush(self):
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        try:
+            await self.db.insert_many(self.table, self.columns, rows)
+        except Exception as e:
+            print(f"[WARN] {self.table} 저장 실패 ({len(rows)}건): {e}")
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.metrics import Counter
+
+load_dotenv()
+
+LOUDNESS_NORMALIZATION = os.getenv("LOUDNESS_NORMALIZATION", "true").lower() == "true"
+LOUDNESS_FILE = os.getenv("LOUDNESS_FILE", "./loudness.json")
+LOUDNESS_TARGET = float(os.getenv("LOUDNESS_TARGET", "-14"))
+LOUDNESS_MAX_TRACKED = 20000
+MAX_PENDING_ANALYSES = 16
+ANALYSIS_TIMEOUT = 180
+MAX_BOOST_DB = 10.0
+MAX_CUT_DB = -20.0
+PEAK_CEILING_DB = -1.0
+
+LOUDNORM_JSON_PATTERN = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}")
+
+analyses_total = Counter(
+    "cerberus_loudness_analyses_total", "Background loudness analyses by result"
+)
+
+
+def db_to_gain(db: float) -> float:
+    return 10 ** (db / 20)
+
+
+class LoudnessAnalyzer:
+    def __init__(
+        self,
+        path: str = LOUDNESS_FILE,
+        target: float = LOUDNESS_TARGET,
+        enabled: bool = LOUDNESS_NORMALIZATION,
+    ):
+        self.path = path
+        self.target = target
+        self.enabled = enabled
+        # video ID -> gain in dB
+        self.gains: OrderedDict[str, float] = OrderedDict()
+        self.tasks: dict[str, asyncio.Task] = {}
+        # One analysis at a time: it decodes the whole track and is never urgent.
+        self.lock = asyncio.Lock()
+
+    def _read(self) -> dict:
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, gains: dict):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(gains, f)
+        os.replace(temp_path, self.path)
+
+    async def load(self):
+        if not self.enabled:
+            return
+        try:
+            self.gains.update(await asyncio.to_thread(self._read))
+        except Exception as e:
+            print(f"[WARN] 음량 분석 결과 로드 실패: {e}")
+        print(f"음량 분석 결과 로드 완료: {len(self.gains)}곡")
+
+    async def save(self):
+        try:
+            await asyncio.to_thread(self._write, dict(self.gains))
+        except Exception as e:
+            print(f"[WARN] 음량 분석 결과 저장 실패: {e}")
+
+    def gain(self, video_id: str) -> float:
+        if not self.enabled:
+            return 1.0
+        db = self.gains.get(video_id)
+        return 1.0 if db is None else db_to_gain(db)
+
+    def request(self, video_id: str, source: Optional[str]):
+        if (
+            not self.enabled
+            or not source
+            or video_id in self.gains
+            or video_id in self.tasks
+            or len(self.tasks) >= MAX_PENDING_ANALYSES
+        ):
+            return
+        self.tasks[video_id] = asyncio.create_task(self.analyze(video_id, source))
+
+    async def analyze(self, video_id: str, source: str):
+        try:
+            async with self.lock:
+                stats = await asyncio.wait_for(
+                    self.measure(source), timeout=ANALYSIS_TIMEOUT
+                )
+            db = self.target - float(stats["input_i"])
+            # Never push true peaks above the ceiling when boosting.
+            db = min(db, PEAK_CEILING_DB - float(stats["input_tp"]))
+            db = max(min(db, MAX_BOOST_DB), MAX_CUT_DB)
+
+            self.gains[video_id] = round(db, 2)
+            self.gains.move_to_end(video_id)
+            while len(self.gains) > LOUDNESS_MAX_TRACKED:
+                self.gains.popitem(last=False)
+            await self.save()
+            analyses_total.inc(result="ok")
+            print(f"음량 분석 완료: {video_id} ({db:+.1f} dB)")
+        except asyncio.TimeoutError:
+            analyses_total.inc(result="timeout")
+            print(f"[WARN] 음량 분석 시간 초과: {video_id}")
+        except Exception as e:
+            analyses_total.inc(result="error")
+            print(f"[WARN] 음량 분석 실패: {video_id} ({e})")
+        finally:
+            self.tasks.pop(video_id, None)
+
+    @staticmethod
+    async def measure(source: str) -> dict:
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-threads",
+            "1",
+            "-i",
+            source,
+            "-vn",
+            "-af",
+            "loudnorm=print_format=json",
+            "-f",
+            "null",
+            "-",
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        match = LOUDNORM_JSON_PATTERN.search(stderr.decode(errors="replace"))
+        if process.returncode != 0 or match is None:
+            raise RuntimeError(f"ffmpeg loudnorm 실패 (code {process.returncode})")
+        stats = json.loads(match.group(0))
+        if stats["input_i"] in ("-inf", "inf"):
+            raise RuntimeError("무음 트랙")
+        return stats
+
+
+loudness = LoudnessAnalyzer()
@@ -2,10 +2,18 @@ import discord
 
 
 async def send_message(
-    interaction: discord.Interaction, content: str, *, followup=False, **kwargs
+    interaction: discord.Interaction | discord.abc.Messageable,
+    content: str,
+    *,
+    followup=False,
+    **kwargs,
 ):
     content = "\n" + content.lstrip()
-    if followup or interaction.response.is_done():
+    if isinstance(interaction, discord.abc.Messageable):
+        # Sessions resumed after a restart have no interaction left to answer.
+        kwargs.pop("ephemeral", None)
+        await interaction.send(content, **kwargs)
+    elif followup or interaction.response.is_done():
         await interaction.followup.send(content, **kwargs)
     else:
         await interaction.response.send_message(content, **kwargs)
@@ -0,0 +1,164 @@
+import asyncio
+import os
+from bisect import bisect_left
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9400"))
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, fn: Optional[Callable] = None):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.values: dict[tuple, float] = {}
+        # Re-registering a name (e.g. on cog reload) replaces the old metric.
+        registry[:] = [metric for metric in registry if metric.name != name]
+        registry.append(self)
+
+    def samples(self):
+        if self.fn is not None:
+            value = self.fn()
+            if isinstance(value, dict):
+                for labels, sample in value.items():
+                    yield self.name, dict(labels), sample
+            else:
+                yield self.name, {}, value
+            return
+        for labels, value in self.values.items():
+            yield self.name, dict(labels), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(buckets)
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            # per-bucket counts, then sum and count
+            series = self.series[key] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self):
+        for key, series in self.series.items():
+            labels = dict(key)
+            cumulative = 0
+            for bucket, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": bucket}, cumulative
+            yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, series[-1]
+            yield f"{self.name}_sum", labels, series[-2]
+            yield f"{self.name}_count", labels, series[-1]
+
+
+registry: list[Metric] = []
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in registry) + "\n"
+
+
+async def handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (
+            b"\r\n",
+            b"\n",
+            b"",
+        ):
+            pass
+
+        parts = request_line.decode(errors="replace").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+            status, body = "200 OK", render_metrics().encode()
+        else:
+            status, body = "404 Not Found", b"not found\n"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT):
+    server = await asyncio.start_server(handle_request, host, port)
+    print(f"✅ 메트릭 서버 시작: http://{host}:{port}/metrics")
+    return server
+
+
+extraction_seconds = Histogram(
+    "cerberus_extraction_seconds", "yt-dlp extraction latency by backend"
+)
+ffmpeg_startup_seconds = Histogram(
+    "cerberus_ffmpeg_startup_seconds", "Time from FFmpeg spawn to the first audio frame"
+)
+play_to_audio_seconds = Histogram(
+    "cerberus_play_to_audio_seconds", "Time from /play to the first audio frame"
+)
+handoff_seconds = Histogram(
+    "cerberus_handoff_seconds", "Gap between the end of a track and the next track's audio"
+)
+scheduler_wait_seconds = Histogram(
+    "cerberus_scheduler_wait_seconds", "Time spent waiting for an admission slot"
+)
+timeouts_total = Counter("cerberus_timeouts_total", "Timed out pipeline stages")
+retries_total = Counter("cerberus_retries_total", "Playback start retries")
+resumes_total = Counter(
+    "cerberus_resumes_total", "Tracks resumed at an offset after a stream failure"
+)
+errors_total = Counter("cerberus_errors_total", "Failed pipeline stages")
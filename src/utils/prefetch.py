@@ -0,0 +1,66 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+from dotenv import load_dotenv
+
+from utils.cache import STREAM_FALLBACK_TTL, get_stream_expiry, metadata_cache
+
+load_dotenv()
+
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "2"))
+PREFETCH_REFRESH_MARGIN = 120
+PREFETCH_RETRY_DELAY = 30
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        resolve: Callable[[str], Awaitable[Optional[dict]]],
+        depth: int = PREFETCH_DEPTH,
+        refresh_margin: float = PREFETCH_REFRESH_MARGIN,
+    ):
+        self.resolve = resolve
+        self.depth = depth
+        self.refresh_margin = refresh_margin
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def update(self, upcoming_urls: list[str]):
+        wanted = list(dict.fromkeys(upcoming_urls))[: self.depth]
+
+        for url in list(self.tasks):
+            if url not in wanted:
+                self.discard(url)
+
+        for url in wanted:
+            task = self.tasks.get(url)
+            if task is None or task.done():
+                self.tasks[url] = asyncio.create_task(self.keep_fresh(url))
+
+    def discard(self, url: str):
+        task = self.tasks.pop(url, None)
+        if task and not task.done():
+            task.cancel()
+
+    def clear(self):
+        for url in list(self.tasks):
+            self.discard(url)
+
+    async def keep_fresh(self, url: str):
+        data = metadata_cache.get_stream(url)
+        while True:
+            if data is None:
+                print(f"[PREFETCH] 스트림 주소 미리 확인 중: {url}")
+                data = await self.resolve(url)
+                if not data:
+                    await asyncio.sleep(PREFETCH_RETRY_DELAY)
+                    continue
+
+            expires_at = get_stream_expiry(data.get("url")) or (
+                time.time() + STREAM_FALLBACK_TTL
+            )
+            await asyncio.sleep(
+                max(expires_at - self.refresh_margin - time.time(), 1)
+            )
+            data = None
@@ -0,0 +1,59 @@
+import os
+from collections import deque
+from typing import Optional
+
+import discord
+
+MESSAGE_BUFFER_SIZE = int(os.getenv("MESSAGE_BUFFER_SIZE", "5000"))
+
+
+class MessageRecord:
+    __slots__ = ("id", "author_name", "author_id", "content", "attachment_ids")
+
+    def __init__(
+        self,
+        id: int,
+        author_name: str,
+        author_id: int,
+        content: str,
+        attachment_ids: tuple[int, ...],
+    ):
+        self.id = id
+        self.author_name = author_name
+        self.author_id = author_id
+        self.content = content
+        self.attachment_ids = attachment_ids
+
+    @classmethod
+    def from_message(cls, message: discord.Message):
+        return cls(
+            message.id,
+            message.author.name,
+            message.author.id,
+            message.content,
+            tuple(attachment.id for attachment in message.attachments),
+        )
+
+
+class MessageRingBuffer:
+    def __init__(self, size: int = MESSAGE_BUFFER_SIZE):
+        self.size = size
+        self.channels: dict[int, deque[int]] = {}
+        self.records: dict[int, MessageRecord] = {}
+
+    def add(self, channel_id: int, message: discord.Message):
+        ring = self.channels.get(channel_id)
+        if ring is None:
+            ring = self.channels[channel_id] = deque(maxlen=self.size)
+        if len(ring) == ring.maxlen:
+            self.records.pop(ring[0], None)
+        ring.append(message.id)
+        self.records[message.id] = MessageRecord.from_message(message)
+
+    def update(self, message: discord.Message):
+        if message.id in self.records:
+            self.records[message.id] = MessageRecord.from_message(message)
+
+    def pop(self, message_id: int) -> Optional[MessageRecord]:
+        # The id stays in the channel ring and falls out when it wraps around.
+        return self.records.pop(message_id, None)
@@ -1,4 +1,147 @@
 import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
 
-yt_dlp_semaphore = asyncio.Semaphore(2)
-ffmpeg_semaphore = asyncio.Semaphore(2)
+from utils.metrics import scheduler_wait_seconds
+from utils.worker import YTDL_WORKERS
+
+
+class Priority(IntEnum):
+    PLAYBACK = 0
+    PREFETCH = 1
+    METADATA = 2
+
+
+class AdmissionScheduler:
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 6,
+        target_latency: float = 5.0,
+        window: int = 20,
+    ):
+        self.name = name
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.active = 0
+        self.waiters: dict[Priority, OrderedDict[int, deque[asyncio.Future]]] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.failures: deque[bool] = deque(maxlen=window)
+        self.completed = 0
+
+    @property
+    def queue_depth(self):
+        return sum(
+            len(futures)
+            for guilds in self.waiters.values()
+            for futures in guilds.values()
+        )
+
+    def _enqueue(self, guild_id: int, priority: Priority) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        guilds = self.waiters[priority]
+        guilds.setdefault(guild_id, deque()).append(future)
+        return future
+
+    def _remove(self, guild_id: int, priority: Priority, future: asyncio.Future):
+        guilds = self.waiters[priority]
+        futures = guilds.get(guild_id)
+        if futures is None:
+            return
+        try:
+            futures.remove(future)
+        except ValueError:
+            pass
+        if not futures:
+            del guilds[guild_id]
+
+    def _next_waiter(self):
+        for priority in Priority:
+            guilds = self.waiters[priority]
+            while guilds:
+                # Round-robin between guilds: serve the first guild, then move it to the end.
+                guild_id, futures = next(iter(guilds.items()))
+                future = futures.popleft()
+                if futures:
+                    guilds.move_to_end(guild_id)
+                else:
+                    del guilds[guild_id]
+                if not future.done():
+                    return future
+        return None
+
+    def _dispatch(self):
+        while self.active < self.limit:
+            future = self._next_waiter()
+            if future is None:
+                return
+            self.active += 1
+            future.set_result(None)
+
+    async def acquire(self, guild_id: int, priority: Priority):
+        if self.active < self.limit and not self.queue_depth:
+            self.active += 1
+            return
+
+        future = self._enqueue(guild_id, priority)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.active -= 1
+                self._dispatch()
+            else:
+                self._remove(guild_id, priority, future)
+            raise
+
+    def release(self, latency: float, failed: bool):
+        self.active -= 1
+        self.latencies.append(latency)
+        self.failures.append(failed)
+        self.completed += 1
+        if self.completed % self.latencies.maxlen == 0:
+            self._adapt()
+        self._dispatch()
+
+    def _adapt(self):
+        latencies = sorted(self.latencies)
+        p90 = latencies[int(len(latencies) * 0.9) - 1]
+        error_rate = sum(self.failures) / len(self.failures)
+
+        if error_rate > 0.2 or p90 > self.target_latency:
+            self.limit = max(self.min_limit, self.limit - 1)
+        elif self.queue_depth and p90 < self.target_latency / 2:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    @asynccontextmanager
+    async def slot(self, guild_id: int = 0, priority: Priority = Priority.METADATA):
+        queued_at = time.perf_counter()
+        await self.acquire(guild_id, priority)
+        started_at = time.perf_counter()
+        scheduler_wait_seconds.observe(
+            started_at - queued_at, scheduler=self.name, priority=priority.name.lower()
+        )
+
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.release(time.perf_counter() - started_at, failed)
+
+
+yt_dlp_scheduler = AdmissionScheduler(
+    "yt-dlp",
+    initial_limit=min(2, YTDL_WORKERS),
+    max_limit=max(2, YTDL_WORKERS),
+    target_latency=8.0,
+)
+ffmpeg_scheduler = AdmissionScheduler("ffmpeg", target_latency=5.0)
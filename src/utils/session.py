@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SESSION_FILE = os.getenv("SESSION_FILE", "./sessions.json")
+SESSION_SAVE_INTERVAL = float(os.getenv("SESSION_SAVE_INTERVAL", "5"))
+# Sessions older than this are dropped instead of resumed after a restart.
+SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", str(60 * 30)))
+
+
+class SessionStore:
+    """Periodic snapshots of every guild's queue, current track and offset.
+
+    Queue changes never touch the disk: a background task collects the state of
+    all players every few seconds and writes one file atomically when it changed.
+    A playing guild's offset moves on every tick, so active sessions stay fresh.
+    """
+
+    def __init__(
+        self,
+        path: str = SESSION_FILE,
+        interval: float = SESSION_SAVE_INTERVAL,
+        max_age: float = SESSION_MAX_AGE,
+    ):
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.collect: Optional[Callable[[], dict[int, dict]]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.last_written: Optional[str] = None
+
+    def _read(self) -> dict:
+        if not os.path.isfile(self.path):
+            return {"sessions": {}}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, content: str):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(f'{{"saved_at": {time.time()}, "sessions": {content}}}')
+            f.flush()
+            # The point of this file is surviving a crash, so make it durable.
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    async def load(self) -> dict[int, dict]:
+        try:
+            data = await asyncio.to_thread(self._read)
+        except Exception as e:
+            print(f"[WARN] 재생 세션 로드 실패: {e}")
+            return {}
+
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            return {}
+        sessions = {
+            int(guild_id): session for guild_id, session in data["sessions"].items()
+        }
+        print(f"재생 세션 로드 완료: {len(sessions)}개")
+        return sessions
+
+    def start(self, collect: Callable[[], dict[int, dict]]):
+        self.collect = collect
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self):
+        if self.collect is None:
+            return
+        try:
+            content = json.dumps(
+                {str(guild_id): session for guild_id, session in self.collect().items()}
+            )
+            if content == self.last_written:
+                return
+            await asyncio.to_thread(self._write, content)
+            self.last_written = content
+        except Exception as e:
+            print(f"[WARN] 재생 세션 저장 실패: {e}")
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
+
+
+session_store = SessionStore()
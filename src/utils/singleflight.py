@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from utils.cache import get_cache_key
+from utils.metrics import Counter
+
+coalesced_total = Counter(
+    "cerberus_coalesced_extractions_total",
+    "Extractions that joined an identical in-flight request",
+)
+
+
+class Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self.flights: dict[Hashable, Flight] = {}
+
+    def _finish(self, key: Hashable, flight: Flight, task: asyncio.Task):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter has gone.
+            task.exception()
+
+    def _leave(self, key: Hashable, flight: Flight):
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Nobody wants the result any more; later callers start a fresh run.
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+            flight.task.cancel()
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]):
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = Flight(asyncio.create_task(fn()))
+            flight.task.add_done_callback(
+                lambda task: self._finish(key, flight, task)
+            )
+            self.flights[key] = flight
+        else:
+            coalesced_total.inc(kind=key[0] if isinstance(key, tuple) else self.name)
+
+        flight.waiters += 1
+        try:
+            # Shielded so that one caller's cancellation or timeout does not
+            # cancel the run for everyone else waiting on it.
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(key, flight)
+
+    def in_flight(self) -> int:
+        return len(self.flights)
+
+
+def extraction_key(kind: str, url: str) -> tuple[str, str]:
+    return kind, get_cache_key(url)
+
+
+extraction_flights = SingleFlight("extraction")
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import subprocess
+import time
+from typing import Awaitable, Callable, Optional
+
+import discord
+from dotenv import load_dotenv
+
+from utils.metrics import Counter, Gauge
+
+load_dotenv()
+
+FFMPEG_STALL_TIMEOUT = float(os.getenv("FFMPEG_STALL_TIMEOUT", "15"))
+SUPERVISOR_INTERVAL = 2
+ORPHAN_GRACE = 5
+
+stalls_total = Counter(
+    "cerberus_ffmpeg_stalls_total", "FFmpeg streams that stopped producing audio"
+)
+
+
+def get_ffmpeg_process(source: discord.AudioSource) -> Optional[subprocess.Popen]:
+    if isinstance(source, discord.PCMVolumeTransformer):
+        source = source.original
+    process = getattr(source, "_process", None)
+    return process if isinstance(process, subprocess.Popen) else None
+
+
+class Watch:
+    __slots__ = (
+        "source",
+        "process",
+        "is_active",
+        "on_stall",
+        "bytes_seen",
+        "progress_at",
+        "stalled",
+    )
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        process: subprocess.Popen,
+        is_active: Callable[[], bool],
+        on_stall: Callable[[], Awaitable[None]],
+    ):
+        self.source = source
+        self.process = process
+        self.is_active = is_active
+        self.on_stall = on_stall
+        self.bytes_seen = 0
+        self.progress_at = time.monotonic()
+        self.stalled = False
+
+
+class FFmpegSupervisor:
+    def __init__(
+        self,
+        stall_timeout: float = FFMPEG_STALL_TIMEOUT,
+        interval: float = SUPERVISOR_INTERVAL,
+    ):
+        self.stall_timeout = stall_timeout
+        self.interval = interval
+        self.watches: dict[int, Watch] = {}
+        # process -> time it stopped being watched (None while in use)
+        self.processes: dict[subprocess.Popen, Optional[float]] = {}
+        self.task: Optional[asyncio.Task] = None
+        Gauge(
+            "cerberus_ffmpeg_processes",
+            "FFmpeg child processes not yet reaped",
+            fn=lambda: len(self.processes),
+        )
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def watch(
+        self,
+        key: int,
+        source: discord.AudioSource,
+        is_active: Callable[[], bool],
+        on_stall: Callable[[], Awaitable[None]],
+    ):
+        self.unwatch(key)
+        process = get_ffmpeg_process(source)
+        if process is None:
+            return
+        self.processes[process] = None
+        self.watches[key] = Watch(source, process, is_active, on_stall)
+
+    def unwatch(self, key: int):
+        watch = self.watches.pop(key, None)
+        if watch:
+            self.processes[watch.process] = time.monotonic()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[WARN] FFmpeg 감시 오류: {e}")
+
+    def check(self):
+        now = time.monotonic()
+        for key, watch in list(self.watches.items()):
+            if watch.process.poll() is not None:
+                continue
+
+            bytes_read = getattr(watch.source, "bytes_read", 0)
+            if bytes_read != watch.bytes_seen or not watch.is_active():
+                watch.bytes_seen = bytes_read
+                watch.progress_at = now
+                continue
+
+            if not watch.stalled and now - watch.progress_at > self.stall_timeout:
+                watch.stalled = True
+                stalls_total.inc()
+                print(f"[WARN] FFmpeg 출력이 {int(now - watch.progress_at)}초간 멈췄습니다.")
+                asyncio.create_task(watch.on_stall())
+
+        for process, orphaned_at in list(self.processes.items()):
+            # poll() reaps the child once it has exited.
+            if process.poll() is not None:
+                del self.processes[process]
+            elif orphaned_at is not None and now - orphaned_at > ORPHAN_GRACE:
+                print(f"[WARN] 남아 있는 FFmpeg 프로세스 종료: pid {process.pid}")
+                process.kill()
+
+
+ffmpeg_supervisor = FFmpegSupervisor()
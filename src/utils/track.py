@@ -0,0 +1,100 @@
+import time
+from typing import Optional
+
+from utils.cache import STREAM_EXPIRY_MARGIN, get_cache_key, get_stream_expiry
+
+
+class Track:
+    __slots__ = (
+        "id",
+        "url",
+        "title",
+        "duration",
+        "requester_id",
+        "stream_url",
+        "http_headers",
+        "acodec",
+        "expires_at",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        title: str,
+        duration: Optional[int] = None,
+        requester_id: int = 0,
+        id: Optional[str] = None,
+    ):
+        self.id = id or get_cache_key(url)
+        self.url = url
+        self.title = title
+        self.duration = duration
+        self.requester_id = requester_id
+        self.stream_url: Optional[str] = None
+        self.http_headers: Optional[dict] = None
+        self.acodec: Optional[str] = None
+        self.expires_at: Optional[float] = None
+
+    @classmethod
+    def from_info(cls, info: dict, url: str, requester_id: int = 0) -> "Track":
+        duration = info.get("duration")
+        track = cls(
+            url,
+            info.get("title") or url,
+            duration=int(duration) if duration else None,
+            requester_id=requester_id,
+            id=info.get("id"),
+        )
+        track.update_stream(info)
+        return track
+
+    def update_stream(self, info: dict):
+        if not info.get("url") or info.get("is_live"):
+            return
+        self.stream_url = info["url"]
+        self.http_headers = info.get("http_headers")
+        self.acodec = info.get("acodec")
+        self.expires_at = get_stream_expiry(self.stream_url)
+
+    def clear_stream(self):
+        self.stream_url = None
+        self.http_headers = None
+        self.expires_at = None
+
+    def has_valid_stream(self, margin: float = STREAM_EXPIRY_MARGIN) -> bool:
+        if not self.stream_url or self.expires_at is None:
+            return False
+        return self.expires_at - margin > time.time()
+
+    def to_record(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_record(cls, record: dict) -> "Track":
+        track = cls(
+            record["url"],
+            record["title"],
+            duration=record.get("duration"),
+            requester_id=record.get("requester_id") or 0,
+            id=record.get("id"),
+        )
+        track.stream_url = record.get("stream_url")
+        track.http_headers = record.get("http_headers")
+        track.acodec = record.get("acodec")
+        track.expires_at = record.get("expires_at")
+        return track
+
+    def stream_info(self) -> dict:
+        """The subset of an extract_info result needed to play this track."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "duration": self.duration,
+            "webpage_url": self.url,
+            "url": self.stream_url,
+            "http_headers": self.http_headers,
+            "acodec": self.acodec,
+        }
+
+    def __repr__(self):
+        return f"<Track {self.id} {self.title!r}>"
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.metrics import Counter as MetricCounter
+from utils.metrics import Histogram
+
+load_dotenv()
+
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.25"))
+WATCHDOG_INTERVAL = 0.05
+PROFILER_INTERVAL = 0.01
+
+loop_lag_seconds = Histogram(
+    "cerberus_loop_lag_seconds",
+    "Event loop scheduling delay",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+loop_blocked_total = MetricCounter(
+    "cerberus_loop_blocked_total", "Callbacks that blocked the loop past the threshold"
+)
+
+
+class LoopWatchdog:
+    def __init__(
+        self,
+        threshold: float = LOOP_LAG_THRESHOLD,
+        interval: float = WATCHDOG_INTERVAL,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.loop_thread_id: Optional[int] = None
+        self.last_beat = time.monotonic()
+        self.reported_beat = 0.0
+        self.running = False
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.profiling = False
+        self.profile_samples: Counter[str] = Counter()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
+        self.thread = threading.Thread(
+            target=self.monitor, name="loop-watchdog", daemon=True
+        )
+        self.thread.start()
+        print(f"✅ 이벤트 루프 감시 시작 (임계값: {int(self.threshold * 1000)}ms)")
+
+    def stop(self):
+        self.running = False
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+
+    async def heartbeat(self):
+        while True:
+            before = time.monotonic()
+            self.last_beat = before
+            await asyncio.sleep(self.interval)
+            loop_lag_seconds.observe(
+                max(time.monotonic() - before - self.interval, 0)
+            )
+
+    def loop_stack(self) -> list[str]:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def monitor(self):
+        while self.running:
+            time.sleep(PROFILER_INTERVAL if self.profiling else self.interval)
+
+            if self.profiling:
+                self.sample()
+
+            beat = self.last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked > self.threshold and beat != self.reported_beat:
+                # Report each stall once, with the stack captured while it is still blocking.
+                self.reported_beat = beat
+                loop_blocked_total.inc()
+                stack = "".join(self.loop_stack())
+                print(
+                    f"[WARN] 이벤트 루프가 {int(blocked * 1000)}ms 이상 막혔습니다.\n{stack}",
+                    file=sys.stderr,
+                )
+
+    def sample(self):
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        code = frame.f_code
+        if code.co_name in ("select", "poll", "_run_once"):
+            return
+        self.profile_samples[f"{code.co_filename}:{frame.f_lineno} {code.co_name}"] += 1
+
+    def set_profiling(self, enabled: bool):
+        if enabled:
+            self.profile_samples.clear()
+        self.profiling = enabled
+
+    def profile_report(self, limit: int = 15) -> str:
+        total = sum(self.profile_samples.values())
+        if not total:
+            return "수집된 샘플이 없습니다."
+        lines = [f"총 {total}개 샘플"]
+        for location, count in self.profile_samples.most_common(limit):
+            lines.append(f"{count * 100 / total:5.1f}%  {location}")
+        return "\n".join(lines)
+
+
+watchdog = LoopWatchdog()
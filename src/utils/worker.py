@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import sys
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+YTDL_WORKERS = int(os.getenv("YTDL_WORKERS", "2"))
+# Separate workers for long jobs (audio cache downloads, playlist listings), so they
+# never hold a worker that the admission scheduler counts on for playback.
+YTDL_BACKGROUND_WORKERS = int(os.getenv("YTDL_BACKGROUND_WORKERS", "2"))
+YTDL_JOB_TIMEOUT = float(os.getenv("YTDL_JOB_TIMEOUT", "30"))
+YTDL_WORKER_MAX_JOBS = int(os.getenv("YTDL_WORKER_MAX_JOBS", "200"))
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "ytdl_worker.py")
+STREAM_LIMIT = 32 * 1024 * 1024
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class WorkerCrashed(ExtractionError):
+    pass
+
+
+class YTDLWorker:
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.jobs = 0
+
+    def is_alive(self):
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        self.jobs = 0
+
+    async def stop(self):
+        if self.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            await self.process.wait()
+
+    async def restart(self):
+        await self.stop()
+        await self.start()
+
+    async def request(self, job: dict, on_partial: Optional[Callable] = None):
+        self.jobs += 1
+        self.process.stdin.write((json.dumps(job) + "\n").encode())
+        await self.process.stdin.drain()
+
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                raise WorkerCrashed(f"yt-dlp 워커 #{self.index} 비정상 종료")
+            response = json.loads(line)
+            if "partial" not in response:
+                return response
+            if on_partial is not None:
+                try:
+                    on_partial(response["partial"])
+                except Exception as e:
+                    # Keep reading so the worker's output stays in sync with its jobs.
+                    print(f"[WARN] 부분 결과 처리 실패: {e}")
+
+
+class YTDLWorkerPool:
+    def __init__(
+        self,
+        size: int = YTDL_WORKERS,
+        timeout: float = YTDL_JOB_TIMEOUT,
+        max_jobs: int = YTDL_WORKER_MAX_JOBS,
+        name: str = "yt-dlp",
+    ):
+        self.name = name
+        self.size = size
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.workers: list[YTDLWorker] = []
+        self.idle: Optional[asyncio.Queue] = None
+        self.restarts = 0
+
+    async def start(self):
+        if self.idle is not None:
+            return
+        self.idle = asyncio.Queue()
+        for i in range(self.size):
+            worker = YTDLWorker(i)
+            self.workers.append(worker)
+            await worker.start()
+            self.idle.put_nowait(worker)
+        print(f"✅ {self.name} 워커 {self.size}개 시작")
+
+    async def close(self):
+        for worker in self.workers:
+            await worker.stop()
+        self.workers.clear()
+        self.idle = None
+
+    async def _recover(self, worker: YTDLWorker):
+        self.restarts += 1
+        try:
+            await worker.restart()
+        except Exception as e:
+            print(f"[WARN] yt-dlp 워커 #{worker.index} 재시작 실패: {e}")
+
+    async def submit(
+        self,
+        kind: str,
+        *,
+        timeout: Optional[float] = None,
+        on_partial: Optional[Callable] = None,
+        **job,
+    ):
+        await self.start()
+        timeout = self.timeout if timeout is None else timeout
+
+        worker = await self.idle.get()
+        try:
+            if not worker.is_alive() or worker.jobs >= self.max_jobs:
+                await self._recover(worker)
+
+            response = await asyncio.wait_for(
+                worker.request({"kind": kind, **job}, on_partial), timeout=timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # The worker may still be busy with the abandoned job.
+            await asyncio.shield(self._recover(worker))
+            raise
+        except (WorkerCrashed, ConnectionError, ValueError):
+            await asyncio.shield(self._recover(worker))
+            raise WorkerCrashed(f"yt-dlp 워커 #{worker.index} 비정상 종료")
+        finally:
+            self.idle.put_nowait(worker)
+
+        if not response["ok"]:
+            raise ExtractionError(response["error"])
+        return response["result"]
+
+
+ytdl_pool = YTDLWorkerPool()
+background_pool = YTDLWorkerPool(size=YTDL_BACKGROUND_WORKERS, name="yt-dlp 백그라운드")
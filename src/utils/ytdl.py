@@ -1,9 +1,21 @@
-def get_ytdl_options(cookiefile: str | None = None):
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PLAYBACK_MODE = os.getenv("PLAYBACK_MODE", "opus")
+# Opus mode starts at full volume so streams can pass through without re-encoding;
+# FFmpeg only decodes and re-encodes after /volume changes it.
+DEFAULT_VOLUME = 1.0 if PLAYBACK_MODE == "opus" else 0.5
+
+
+def get_ytdl_options(cookiefile: str | None = None, playlist: bool = False):
     options = {
         "format": "bestaudio/best",
         "outtmpl": "%(extractor)s-%(id)s-%(title)s.%(ext)s",
         "restrictfilenames": True,
-        "noplaylist": True,
+        "noplaylist": not playlist,
         "nocheckcertificate": True,
         "ignoreerrors": False,
         "logtostderr": False,
@@ -12,6 +24,9 @@ def get_ytdl_options(cookiefile: str | None = None):
         "default_search": "auto",
         "source_address": "0.0.0.0",
     }
+    if playlist:
+        options["extract_flat"] = "in_playlist"
+        options["lazy_playlist"] = True
     if cookiefile:
         options["cookiefile"] = cookiefile
     return options
@@ -21,3 +36,29 @@ ffmpeg_options = {
     "before_options": "-fflags +genpts -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -re",
     "options": "-vn -bufsize 256k -ar 48000 -ac 2",
 }
+
+# Pre-buffered sources must read ahead, so they run without -re.
+prebuffer_ffmpeg_options = {
+    "before_options": "-fflags +genpts -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
+    "options": ffmpeg_options["options"],
+}
+
+file_ffmpeg_options = {
+    "before_options": "-fflags +genpts",
+    "options": "-vn -ar 48000 -ac 2",
+}
+
+
+def get_opus_ffmpeg_options(volume: float = 1.0, base: dict = ffmpeg_options):
+    options = dict(base)
+    if volume != 1.0:
+        options["options"] += f" -filter:a volume={volume:.3f}"
+    return options
+
+
+def with_seek(options: dict, position: float):
+    if position <= 0:
+        return options
+    options = dict(options)
+    options["before_options"] = f"-ss {position:.2f} " + options["before_options"]
+    return options
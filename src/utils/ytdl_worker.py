@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+from collections import OrderedDict
+
+MAX_INSTANCES = 4
+UNAVAILABLE_TITLES = ("[Private video]", "[Deleted video]")
+
+
+def open_protocol_stream():
+    # yt-dlp may print to stdout, so the protocol gets its own copy of the pipe
+    # and everything else written to stdout is sent to stderr instead.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return protocol
+
+
+def main():
+    protocol = open_protocol_stream()
+
+    import yt_dlp
+
+    instances: OrderedDict[str, yt_dlp.YoutubeDL] = OrderedDict()
+
+    def get_ydl(key: str, options: dict):
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(options)
+            instances[key] = ydl
+            while len(instances) > MAX_INSTANCES:
+                instances.popitem(last=False)
+        instances.move_to_end(key)
+        return ydl
+
+    def extract(job: dict):
+        options = job["options"]
+        ydl = get_ydl(json.dumps(options, sort_keys=True), options)
+        download = job.get("download", False)
+        info = ydl.extract_info(job["url"], download=download)
+        info = info["entries"][0] if "entries" in info else info
+        filename = ydl.prepare_filename(info) if download else None
+        return {"info": ydl.sanitize_info(info), "filename": filename}
+
+    def extract_cli(job: dict):
+        args = job["args"]
+        parsed = yt_dlp.parse_options(args)
+        ydl = get_ydl(json.dumps(["cli", *args]), parsed.ydl_opts)
+        info = ydl.extract_info(job["url"], download=False)
+        return {"info": ydl.sanitize_info(info), "filename": None}
+
+    def emit(payload: dict):
+        protocol.write(json.dumps(payload) + "\n")
+        protocol.flush()
+
+    def extract_playlist(job: dict):
+        # Flat, lazy extraction: each entry is sent as soon as its page is fetched,
+        # without resolving any of the videos themselves.
+        options = job["options"]
+        ydl = get_ydl(json.dumps(options, sort_keys=True), options)
+        info = ydl.extract_info(job["url"], download=False, process=False)
+        limit = job.get("limit")
+        max_duration = job.get("max_duration")
+
+        count = 0
+        skipped = 0
+        for entry in info.get("entries") or []:
+            if limit is not None and count >= limit:
+                break
+            if not entry or not entry.get("url"):
+                skipped += 1
+                continue
+
+            duration = entry.get("duration")
+            if (
+                entry.get("live_status") in ("is_live", "is_upcoming")
+                or entry.get("title") in UNAVAILABLE_TITLES
+                or (max_duration and duration and duration >= max_duration)
+            ):
+                skipped += 1
+                continue
+
+            emit(
+                {
+                    "ok": True,
+                    "partial": {
+                        "id": entry.get("id"),
+                        "title": entry.get("title"),
+                        "duration": duration,
+                        "is_live": False,
+                        "webpage_url": entry["url"],
+                    },
+                }
+            )
+            count += 1
+        return {"title": info.get("title"), "count": count, "skipped": skipped}
+
+    handlers = {"extract": extract, "cli": extract_cli, "playlist": extract_playlist}
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            result = handlers[job["kind"]](job)
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        emit(response)
+
+
+if __name__ == "__main__":
+    main()